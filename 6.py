@@ -448,10 +448,11 @@ def inspect_data_storage():
     print(f"   • Database Removed: Using simple file storage")
     
     # Check local files
+    from database_manager import PREDICTIONS_FILE
     print(f"\n📁 Local File Status:")
     files_to_check = [
         'crypto_predictions.db',
-        'detailed_predictions.json',
+        PREDICTIONS_FILE,
         'deep_learning_insights.json',
         'market_data.json'
     ]
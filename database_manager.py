@@ -1,22 +1,246 @@
 import os
+import sys
+import hashlib
+import gzip
+import atexit
+import copy
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float, Boolean, JSON
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float, Boolean, JSON, Index, MetaData
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex, CreateTable
+from contextlib import contextmanager
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy import text, select, insert, update, bindparam, func, event, inspect, literal_column
+
+try:
+    import ciso8601
+    CISO8601_AVAILABLE = True
+except ImportError:
+    CISO8601_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Compact separators for the JSON fallback files (pretty output via dump_pretty)
+JSON_SEPARATORS = (',', ':')
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    
+    def _json_dumps(data: Any, sort_keys: bool = False) -> bytes:
+        """Encode `data` as compact JSON bytes"""
+        options = _ORJSON_OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else _ORJSON_OPTIONS
+        return orjson.dumps(data, default=str, option=options)
+    
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(data: Any, sort_keys: bool = False) -> bytes:
+        """Encode `data` as compact JSON bytes"""
+        return json.dumps(data, default=str, separators=JSON_SEPARATORS, sort_keys=sort_keys).encode('utf-8')
+    
+    _json_loads = json.loads
+
+# Optional on-disk compression for the JSON fallback files: 'gzip', 'zstd' or off
+JSON_COMPRESSION = os.getenv('JSON_FALLBACK_COMPRESSION', '').strip().lower()
+if JSON_COMPRESSION == 'zstd' and not ZSTD_AVAILABLE:
+    logger.warning("zstandard not installed - using gzip for JSON fallback files")
+    JSON_COMPRESSION = 'gzip'
+_COMPRESSED_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+# JSON fallback file for predictions: one JSON record per line, so saves append
+PREDICTIONS_FILE = "detailed_predictions.jsonl"
+# Older single JSON array file, migrated to PREDICTIONS_FILE on first use
+LEGACY_PREDICTIONS_FILE = "detailed_predictions.json"
+
+# JSON fallback store for learning insights: one file per insight at
+# INSIGHTS_DIR/<insight_type>/<period>.json, so saving one insight rewrites only its file
+INSIGHTS_DIR = "deep_learning_insights"
+# Older single-file store ({"<type>_<period>": insight}), migrated on first use
+LEGACY_INSIGHTS_FILE = "deep_learning_insights.json"
+
+# One lock per JSON fallback file so concurrent writers don't interleave
+_file_locks: Dict[str, threading.Lock] = {}
+_file_locks_guard = threading.Lock()
+
+def _file_lock(filename: str) -> threading.Lock:
+    """Get the in-process lock serializing writes to `filename`"""
+    with _file_locks_guard:
+        lock = _file_locks.get(filename)
+        if lock is None:
+            lock = _file_locks[filename] = threading.Lock()
+        return lock
+
+def _set_sqlite_pragmas(dbapi_conn, connection_record):
+    """Use WAL and relaxed fsync on the local SQLite database (applied per connection)"""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")   # 256 MB
+    cursor.execute("PRAGMA cache_size=-65536")     # 64 MB
+    cursor.close()
+
+def _resolve_json_path(filename: str) -> Optional[str]:
+    """Find the on-disk file backing `filename`, honouring JSON_COMPRESSION"""
+    path = filename + _COMPRESSED_SUFFIXES.get(JSON_COMPRESSION, '')
+    if os.path.exists(path):
+        return path
+    # Plain file written before compression was switched on
+    if os.path.exists(filename):
+        return filename
+    return None
+
+def _is_json_lines(path: str) -> bool:
+    """True for JSON Lines files (ignoring any compression suffix)"""
+    for suffix in _COMPRESSED_SUFFIXES.values():
+        if path.endswith(suffix):
+            path = path[:-len(suffix)]
+    return path.endswith('.jsonl')
+
+def _read_json(path: str) -> Any:
+    """Load a (possibly compressed) JSON or JSON Lines fallback file"""
+    with open(path, 'rb') as f:
+        blob = f.read()
+    if path.endswith('.gz'):
+        blob = gzip.decompress(blob)
+    elif path.endswith('.zst'):
+        blob = zstandard.ZstdDecompressor().decompress(blob)
+    if _is_json_lines(path):
+        return [_json_loads(line) for line in blob.splitlines() if line.strip()]
+    return _json_loads(blob)
+
+def _iter_json_array(path: str):
+    """Yield the items of a (possibly compressed) JSON array file one at a time"""
+    if not IJSON_AVAILABLE:
+        yield from _read_json(path)
+        return
+    
+    with open(path, 'rb') as raw:
+        if path.endswith('.gz'):
+            f = gzip.GzipFile(fileobj=raw)
+        elif path.endswith('.zst'):
+            f = zstandard.ZstdDecompressor().stream_reader(raw)
+        else:
+            f = raw
+        yield from ijson.items(f, 'item', use_float=True)
+
+def _path_component(value: Any) -> str:
+    """Make an insight type/period safe to use as a file or directory name"""
+    return str(value).replace(os.sep, '_').replace('/', '_')
+
+def _insight_path(insight_type: str, period: str) -> str:
+    """Logical JSON file holding one learning insight"""
+    return os.path.join(INSIGHTS_DIR, _path_component(insight_type), _path_component(period) + '.json')
+
+def _list_insight_files(insight_type: Optional[str] = None) -> List[str]:
+    """Logical paths of stored insight files, optionally for one insight type"""
+    if insight_type is not None:
+        type_dirs = [os.path.join(INSIGHTS_DIR, _path_component(insight_type))]
+    elif os.path.isdir(INSIGHTS_DIR):
+        type_dirs = [os.path.join(INSIGHTS_DIR, name) for name in os.listdir(INSIGHTS_DIR)]
+    else:
+        type_dirs = []
+    
+    paths = set()
+    for type_dir in type_dirs:
+        if not os.path.isdir(type_dir):
+            continue
+        for name in os.listdir(type_dir):
+            # Strip compression suffixes so each insight is listed once
+            for suffix in _COMPRESSED_SUFFIXES.values():
+                if name.endswith(suffix):
+                    name = name[:-len(suffix)]
+            if name.endswith('.json'):
+                paths.add(os.path.join(type_dir, name))
+    return sorted(paths)
+
+def _json_contains(document: Any, fragment: Any) -> bool:
+    """Python equivalent of PostgreSQL's jsonb `@>` containment operator"""
+    if isinstance(fragment, dict):
+        return isinstance(document, dict) and all(
+            key in document and _json_contains(document[key], value) for key, value in fragment.items()
+        )
+    if isinstance(fragment, list):
+        return isinstance(document, list) and all(
+            any(_json_contains(item, wanted) for item in document) for wanted in fragment
+        )
+    return document == fragment
+
+def _write_json_atomic(filename: str, data: Any) -> None:
+    """Serialize `data` once and atomically replace `filename` with it"""
+    if _is_json_lines(filename):
+        blob = b''.join(_json_dumps(record) + b'\n' for record in data)
+    else:
+        blob = _json_dumps(data)
+    if JSON_COMPRESSION == 'gzip':
+        blob = gzip.compress(blob, compresslevel=6)
+    elif JSON_COMPRESSION == 'zstd':
+        blob = zstandard.ZstdCompressor(level=3).compress(blob)
+    
+    path = filename + _COMPRESSED_SUFFIXES.get(JSON_COMPRESSION, '')
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+# ISO-8601 parser, picked once at import time
+if CISO8601_AVAILABLE:
+    _fromisoformat = ciso8601.parse_datetime
+elif sys.version_info >= (3, 11):
+    _fromisoformat = datetime.fromisoformat  # Understands a trailing 'Z' natively
+else:
+    def _fromisoformat(value: str) -> datetime:
+        return datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp (trailing 'Z' allowed), caching repeated strings.
+    
+    Callers handle None/empty values themselves so they never reach the cache.
+    """
+    return _fromisoformat(value)
+
 Base = declarative_base()
 
 class PredictionRecord(Base):
     __tablename__ = 'predictions'
+    __table_args__ = (
+        # get_predictions_by_method: WHERE method = ? ORDER BY timestamp DESC (a backward index scan)
+        Index('ix_predictions_method_ts', 'method', 'timestamp'),
+        # load_predictions: ORDER BY timestamp DESC
+        Index('ix_predictions_timestamp', 'timestamp'),
+        # Serves `validation_points @> '[...]'` containment lookups on PostgreSQL only
+        Index('ix_predictions_vp_gin', 'validation_points',
+              postgresql_using='gin', postgresql_ops={'validation_points': 'jsonb_path_ops'}).ddl_if(dialect='postgresql'),
+    )
     
     id = Column(Integer, primary_key=True)
     
@@ -36,6 +260,7 @@ class PredictionRecord(Base):
     
     # Validation field (filled later)
     accuracy = Column(Float, nullable=True)       # Actual accuracy result (empty initially)
+    validation_points = Column(JSONB().with_variant(JSON, 'sqlite'), nullable=True)  # Hit/miss checkpoints
     
     # Optional metadata
     coin = Column(String(10), default='BTC')      # BTC or ETH
@@ -47,14 +272,32 @@ class PredictionRecord(Base):
 
 class LearningInsight(Base):
     __tablename__ = 'learning_insights'
+    __table_args__ = (
+        # Serves `data @> '{...}'` containment lookups on PostgreSQL; SQLite would
+        # build a plain B-tree over every JSON document, so it gets none
+        Index('ix_learning_insights_data_gin', 'data',
+              postgresql_using='gin', postgresql_ops={'data': 'jsonb_path_ops'}).ddl_if(dialect='postgresql'),
+    )
     
     id = Column(Integer, primary_key=True)
     insight_type = Column(String(50), nullable=False)  # weekly, monthly, best_setup, etc.
     period = Column(String(50))  # 2025-W20, 2025-05, etc.
-    data = Column(JSON, nullable=False)
+    data = Column(JSONB().with_variant(JSON, 'sqlite'), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+# One row per insight type and period; target of the save upsert. COALESCE makes
+# a NULL period one key like any other - a plain unique index treats NULLs as distinct
+INSIGHT_KEY = (LearningInsight.insight_type, func.coalesce(LearningInsight.period, literal_column("''")))
+INSIGHT_KEY_INDEX = Index('uq_learning_insights_type_period', *INSIGHT_KEY, unique=True)
+
+# JSONB GIN indexes, created on PostgreSQL only
+POSTGRES_ONLY_INDEXES = ('ix_predictions_vp_gin', 'ix_learning_insights_data_gin')
+
+# UNIQUE (timestamp, method, coin) that some predictions tables were created with;
+# it rejected re-saves of validated predictions, so migrations remove it
+DROPPED_PREDICTIONS_CONSTRAINT = 'uq_predictions_timestamp_method_coin'
+
 class PredictionHistory(Base):
     __tablename__ = 'prediction_history'
     
@@ -64,17 +307,75 @@ class PredictionHistory(Base):
     accuracy_score = Column(Float)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+# Statements built once at import; SQLAlchemy caches their compiled SQL across calls.
+# They select plain columns so rows come back as mappings without ORM hydration.
+_LOAD_PREDICTIONS_STMT = select(
+    PredictionRecord.date,
+    PredictionRecord.time,
+    PredictionRecord.timestamp,
+    PredictionRecord.method,
+    PredictionRecord.entry_level,
+    PredictionRecord.stop_loss,
+    PredictionRecord.take_profit,
+    PredictionRecord.confidence,
+    PredictionRecord.accuracy,
+    PredictionRecord.validation_points,
+    PredictionRecord.coin,
+    PredictionRecord.notes,
+    PredictionRecord.validated_at
+).order_by(PredictionRecord.timestamp.desc())
+_LEARNING_INSIGHTS_STMT = select(
+    LearningInsight.insight_type,
+    LearningInsight.period,
+    LearningInsight.data,
+    LearningInsight.updated_at
+).order_by(LearningInsight.updated_at.desc())
+
+def _row_to_dict(row) -> Dict:
+    """Turn a result mapping into a plain dict with ISO-formatted datetimes"""
+    return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in row.items()}
+
 class DatabaseManager:
+    # Columns returned by load_predictions_summary()
+    SUMMARY_FIELDS = ('date', 'time', 'timestamp', 'method', 'confidence', 'accuracy', 'coin')
+    
+    # Write-behind settings for the in-memory JSON fallback mirror
+    FLUSH_DELAY = 2.0   # Seconds a dirty mirror may wait before being written out
+    FLUSH_EVERY = 50    # Pending mutations that force an immediate flush
+    
+    # Content hashes of recently saved predictions, to skip duplicate saves
+    SEEN_PREDICTIONS_MAX = 256
+    
+    # How long read results (and health_check counts) may be served from cache
+    READ_CACHE_TTL = 30.0
+    
     def __init__(self):
         self.engine = None
         self.Session = None
         self.use_database = False
+        self._tables_exist = False
+        self._insight_upsert = False   # Set once the insight unique index exists
+        
+        # In-memory mirror of JSON prediction files (filename -> records)
+        self._mem: Dict[str, List[Dict]] = {}
+        self._mem_idx: Dict[str, Dict[str, int]] = {}   # filename -> {timestamp: position}
+        self._mem_mtime: Dict[str, Optional[float]] = {}
+        self._mem_dirty: Dict[str, int] = {}
+        self._mem_lock = threading.RLock()
+        self._flush_timer = None
+        atexit.register(self.flush)
+        
+        # Read-result cache: (call, args...) -> (fetched_at, value); cleared on writes
+        self._cache: Dict[tuple, Tuple[float, Any]] = {}
+        
+        self._seen_predictions = OrderedDict()
+        
         self.initialize_database()
     
     def _migrate_sqlite_schema(self):
-        """Migrate SQLite schema to add missing columns"""
+        """Migrate SQLite schema to add missing columns (all in one transaction)"""
         try:
-            with self.engine.connect() as conn:
+            with self.engine.begin() as conn:
                 # Get existing columns
                 result = conn.execute(text("PRAGMA table_info(predictions)"))
                 existing_columns = {row[1] for row in result.fetchall()}
@@ -88,36 +389,108 @@ class DatabaseManager:
                     'take_profit': 'FLOAT',
                     'confidence': 'FLOAT',
                     'accuracy': 'FLOAT',
+                    'validation_points': 'JSON',
                     'coin': 'VARCHAR(10) DEFAULT "BTC"',
                     'notes': 'VARCHAR(500)',
                     'created_at': 'DATETIME',
                     'validated_at': 'DATETIME'
                 }
                 
-                # Add missing columns
-                added_columns = []
-                for column_name, column_type in required_columns.items():
-                    if column_name not in existing_columns:
-                        try:
-                            conn.execute(text(f"ALTER TABLE predictions ADD COLUMN {column_name} {column_type}"))
-                            added_columns.append(column_name)
-                            logger.info(f"Added SQLite column: {column_name}")
-                        except Exception as e:
-                            logger.warning(f"Failed to add SQLite column {column_name}: {e}")
-                
-                conn.commit()
-                
-                if added_columns:
-                    logger.info(f"SQLite schema migration completed. Added columns: {added_columns}")
-                else:
-                    logger.info("SQLite schema is up to date")
+                # Add missing columns; any failure rolls back the whole migration
+                added_columns = [name for name in required_columns if name not in existing_columns]
+                for column_name in added_columns:
+                    conn.execute(text(f"ALTER TABLE predictions ADD COLUMN {column_name} {required_columns[column_name]}"))
                 
-                return True
+                # PostgreSQL-only GIN indexes that older versions also built here as B-trees
+                for index_name in POSTGRES_ONLY_INDEXES:
+                    conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+                
+                # SQLite can't drop a constraint in place, so rebuild tables that have it
+                table_sql = conn.execute(text(
+                    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'predictions'"
+                )).scalar()
+                if table_sql and DROPPED_PREDICTIONS_CONSTRAINT in table_sql:
+                    self._rebuild_sqlite_predictions(conn)
+                    logger.info(f"Rebuilt SQLite predictions table without {DROPPED_PREDICTIONS_CONSTRAINT}")
+            
+            if added_columns:
+                logger.info(f"SQLite schema migration completed. Added columns: {added_columns}")
+            else:
+                logger.info("SQLite schema is up to date")
+            
+            return True
                 
         except Exception as e:
             logger.error(f"SQLite schema migration failed: {e}")
             return False
     
+    @staticmethod
+    def _rebuild_sqlite_predictions(conn):
+        """Recreate the SQLite predictions table from the model, keeping its rows
+        
+        The indexes go with the old table; initialize_database recreates them.
+        """
+        table = PredictionRecord.__table__
+        rebuilt = table.to_metadata(MetaData(), name='predictions_rebuild')
+        columns = ", ".join(f'"{column.name}"' for column in table.columns)
+        
+        conn.execute(CreateTable(rebuilt))
+        conn.execute(text(f"INSERT INTO predictions_rebuild ({columns}) SELECT {columns} FROM predictions"))
+        conn.execute(text("DROP TABLE predictions"))
+        conn.execute(text("ALTER TABLE predictions_rebuild RENAME TO predictions"))
+    
+    def _migrate_postgres_schema(self):
+        """Bring PostgreSQL tables created by older versions up to date"""
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text("ALTER TABLE predictions ADD COLUMN IF NOT EXISTS validation_points JSONB"))
+                conn.execute(text(f"ALTER TABLE predictions DROP CONSTRAINT IF EXISTS {DROPPED_PREDICTIONS_CONSTRAINT}"))
+            return True
+            
+        except Exception as e:
+            logger.error(f"PostgreSQL schema migration failed: {e}")
+            return False
+    
+    def _ensure_insight_unique_index(self):
+        """Create the unique index the learning insight upsert relies on
+        
+        Fails on tables that still hold duplicate insights from the old
+        select-then-insert save; `python migrate_db.py` removes those. Until
+        then saves fall back to select-then-update.
+        """
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(CreateIndex(INSIGHT_KEY_INDEX, if_not_exists=True))
+            self._insight_upsert = True
+            
+        except Exception as e:
+            logger.warning(f"Could not create index {INSIGHT_KEY_INDEX.name} "
+                           f"(run migrate_db.py to remove duplicate learning insights): {e}")
+            self._insight_upsert = False
+        
+        return self._insight_upsert
+    
+    @staticmethod
+    def _build_engine(database_url: str):
+        """Create the engine with the same pooling settings for every backend"""
+        engine_options = {
+            'echo': False,
+            'pool_pre_ping': True,   # Verify connections before use
+            'pool_recycle': 300,     # Recycle connections every 5 minutes
+            'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+            'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+            'insertmanyvalues_page_size': 1000,  # Rows per multi-VALUES INSERT
+        }
+        
+        if database_url.startswith('postgresql'):
+            # Enhanced PostgreSQL connection with proper settings for Render
+            engine_options['executemany_mode'] = 'values_plus_batch'  # Batch executemany UPDATEs (psycopg2)
+            engine_options['connect_args'] = {
+                "sslmode": "require",  # Require SSL for security
+            }
+        
+        return create_engine(database_url, **engine_options)
+    
     def initialize_database(self):
         """Initialize database connection with enhanced PostgreSQL support for Render"""
         try:
@@ -125,40 +498,47 @@ class DatabaseManager:
             database_url = os.getenv('DATABASE_URL')
             
             if database_url:
-                # Fix for Render's PostgreSQL URL format
-                if database_url.startswith('postgres://'):
-                    database_url = database_url.replace('postgres://', 'postgresql://', 1)
+                # Fix for Render's PostgreSQL URL format, pinning psycopg2 (the driver in
+                # requirements.txt) - SQLAlchemy 2.1 maps a bare postgresql:// to psycopg 3
+                for scheme in ('postgres://', 'postgresql://'):
+                    if database_url.startswith(scheme):
+                        database_url = 'postgresql+psycopg2://' + database_url[len(scheme):]
                 
                 logger.info("Connecting to PostgreSQL database...")
-                # Enhanced PostgreSQL connection with proper settings for Render
-                self.engine = create_engine(
-                    database_url,
-                    echo=False,
-                    pool_pre_ping=True,  # Verify connections before use
-                    pool_recycle=300,    # Recycle connections every 5 minutes
-                    connect_args={
-                        "sslmode": "require",  # Require SSL for security
-                    }
-                )
+                self.engine = self._build_engine(database_url)
                 
             else:
                 # Local development - use SQLite
                 logger.info("Using local SQLite database...")
-                self.engine = create_engine('sqlite:///crypto_predictions.db', echo=False)
+                self.engine = self._build_engine('sqlite:///crypto_predictions.db')
+            
+            if self.engine.url.drivername.startswith('sqlite'):
+                event.listen(self.engine, "connect", _set_sqlite_pragmas)
             
             # Create tables
             Base.metadata.create_all(bind=self.engine)
-            self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+            self._tables_exist = True
+            # expire_on_commit=False keeps loaded rows readable after the session commits
+            self.Session = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=self.engine)
             self.use_database = True
             
             # For SQLite, check and migrate schema if needed
             if not database_url:  # SQLite (local)
                 self._migrate_sqlite_schema()
+            elif self.engine.dialect.name == 'postgresql':
+                self._migrate_postgres_schema()
+            
+            # create_all skips indexes on tables that already existed
+            for index in PredictionRecord.__table__.indexes:
+                try:
+                    index.create(bind=self.engine, checkfirst=True)
+                except Exception as e:
+                    logger.warning(f"Could not create index {index.name}: {e}")
+            self._ensure_insight_unique_index()
             
             # Test connection
-            session = self.get_session()
-            session.execute(text("SELECT 1"))
-            session.close()
+            with self._session() as session:
+                session.execute(text("SELECT 1"))
             
             logger.info("Database initialized successfully!")
             
@@ -167,69 +547,224 @@ class DatabaseManager:
             logger.info("Falling back to JSON file storage...")
             self.use_database = False
     
+    def dump_pretty(self, filename: str = PREDICTIONS_FILE) -> str:
+        """Return an indented copy of a JSON fallback file for human inspection"""
+        self.flush()
+        path = _resolve_json_path(filename)
+        if path is None:
+            return ""
+        return json.dumps(_read_json(path), indent=4, default=str)
+    
+    def _mem_load(self, filename: str) -> List[Dict]:
+        """Get the in-memory copy of a JSON predictions file, (re)loading it when needed"""
+        with self._mem_lock:
+            path = _resolve_json_path(filename)
+            if path is None and filename == PREDICTIONS_FILE:
+                path = self._migrate_legacy_predictions()
+            mtime = os.path.getmtime(path) if path else None
+            
+            # Pending writes win; otherwise reload if another process rewrote the file
+            if filename in self._mem and (filename in self._mem_dirty or mtime == self._mem_mtime.get(filename)):
+                return self._mem[filename]
+            
+            data = _read_json(path) if path else []
+            
+            # Index by timestamp (first occurrence wins, like the old linear scan)
+            index = {}
+            for i, prediction in enumerate(data):
+                index.setdefault(prediction.get('timestamp'), i)
+            
+            self._mem[filename] = data
+            self._mem_idx[filename] = index
+            self._mem_mtime[filename] = mtime
+            return data
+    
+    def _migrate_legacy_predictions(self) -> Optional[str]:
+        """Convert the legacy JSON array file to JSON Lines; returns the new path"""
+        legacy_path = _resolve_json_path(LEGACY_PREDICTIONS_FILE)
+        if legacy_path is None:
+            return None
+        
+        with _file_lock(PREDICTIONS_FILE):
+            # Streamed, so the legacy array is never held as one big Python list
+            _write_json_atomic(PREDICTIONS_FILE, _iter_json_array(legacy_path))
+        # The legacy file is left in place as a backup; nothing reads it after this
+        logger.info(f"Migrated {legacy_path} to {PREDICTIONS_FILE}")
+        return _resolve_json_path(PREDICTIONS_FILE)
+    
+    def _mem_append(self, filename: str, prediction_data: Dict):
+        """Append a record to the in-memory mirror, keeping the timestamp index current"""
+        with self._mem_lock:
+            data = self._mem_load(filename)
+            self._mem_idx[filename].setdefault(prediction_data.get('timestamp'), len(data))
+            data.append(prediction_data)
+            
+            if filename in self._mem_dirty or JSON_COMPRESSION or not _is_json_lines(filename):
+                # A full rewrite is pending or needed anyway
+                self._mem_mark_dirty(filename)
+                return
+            
+            # JSON Lines: append just this record instead of rewriting the file
+            with _file_lock(filename):
+                with open(filename, 'ab') as f:
+                    f.write(_json_dumps(prediction_data) + b'\n')
+            self._mem_mtime[filename] = os.path.getmtime(filename)
+    
+    def _mem_find(self, filename: str, prediction_id: str) -> Optional[Dict]:
+        """Look up a mirrored record by its timestamp"""
+        with self._mem_lock:
+            data = self._mem_load(filename)
+            i = self._mem_idx[filename].get(prediction_id)
+            return data[i] if i is not None else None
+    
+    def _mem_mark_dirty(self, filename: str):
+        """Record a mutation of the in-memory mirror and schedule a flush"""
+        with self._mem_lock:
+            self._mem_dirty[filename] = self._mem_dirty.get(filename, 0) + 1
+            
+            if self._mem_dirty[filename] >= self.FLUSH_EVERY:
+                self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.FLUSH_DELAY, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def flush(self):
+        """Write any pending in-memory JSON changes to disk"""
+        with self._mem_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            
+            for filename in list(self._mem_dirty):
+                try:
+                    with _file_lock(filename):
+                        _write_json_atomic(filename, self._mem[filename])
+                    self._mem_mtime[filename] = os.path.getmtime(_resolve_json_path(filename))
+                    del self._mem_dirty[filename]
+                except Exception as e:
+                    logger.error(f"Error flushing {filename}: {e}")
+    
+    def _cache_get(self, key: tuple) -> Tuple[bool, Any]:
+        """Look up a cached read result; returns (hit, value)"""
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.READ_CACHE_TTL:
+            return True, entry[1]
+        return False, None
+    
+    def _cache_put(self, key: tuple, value: Any):
+        """Store a read result in the cache"""
+        self._cache[key] = (time.monotonic(), value)
+    
+    def invalidate_cache(self):
+        """Drop all cached read results (called after every write)"""
+        self._cache.clear()
+    
+    def _cached_rows(self, key: tuple, loader) -> List[Dict]:
+        """Serve a list of row dicts from the cache, loading it on a miss"""
+        hit, rows = self._cache_get(key)
+        if not hit:
+            rows = loader()
+            self._cache_put(key, rows)
+        # Deep copies so callers can't mutate the cached rows or their nested
+        # values (validation_points lists, insight data dicts)
+        return copy.deepcopy(rows)
+    
     def get_session(self) -> Session:
         """Get database session"""
         if not self.use_database:
             raise Exception("Database not available")
         return self.Session()
     
+    @contextmanager
+    def _session(self):
+        """Session scope: commits on success, rolls back on error, always closes"""
+        session = self.get_session()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
     def save_prediction(self, prediction_data: Dict) -> bool:
         """Save prediction to database or JSON file"""
+        # Retries re-submitting an already saved prediction are no-ops
+        content_hash = hashlib.blake2b(
+            _json_dumps(prediction_data, sort_keys=True),
+            digest_size=16
+        ).digest()
+        if content_hash in self._seen_predictions:
+            self._seen_predictions.move_to_end(content_hash)
+            logger.info("Prediction already saved - skipping duplicate")
+            return True
+        
         if self.use_database:
-            return self._save_prediction_db(prediction_data)
+            saved = self._save_prediction_db(prediction_data)
         else:
-            return self._save_prediction_json(prediction_data, "detailed_predictions.json")
+            saved = self._save_prediction_json(prediction_data, PREDICTIONS_FILE)
+        self.invalidate_cache()
+        
+        if saved:
+            self._seen_predictions[content_hash] = None
+            if len(self._seen_predictions) > self.SEEN_PREDICTIONS_MAX:
+                self._seen_predictions.popitem(last=False)
+        return saved
     
-    def _save_prediction_db(self, prediction_data: Dict) -> bool:
-        """Save prediction to database"""
+    def save_predictions_bulk(self, predictions: List[Dict]) -> bool:
+        """Save many predictions at once (one multi-row INSERT per page on the database)"""
+        if not predictions:
+            return True
+        self.invalidate_cache()
+        if self.use_database:
+            return self._save_predictions_bulk_db(predictions)
+        else:
+            return all(self._save_prediction_json(prediction, PREDICTIONS_FILE) for prediction in predictions)
+    
+    @staticmethod
+    def _prediction_row(prediction_data: Dict) -> Dict:
+        """Map a prediction dict onto predictions table columns"""
+        return {
+            'date': prediction_data.get('date'),
+            'time': prediction_data.get('time'),
+            'timestamp': _parse_iso(prediction_data['timestamp']) if prediction_data.get('timestamp') else datetime.utcnow(),
+            'method': prediction_data.get('method'),
+            'entry_level': prediction_data.get('entry_level'),
+            'stop_loss': prediction_data.get('stop_loss'),
+            'take_profit': prediction_data.get('take_profit'),
+            'confidence': prediction_data.get('confidence'),
+            'accuracy': prediction_data.get('accuracy'),  # Initially None/empty
+            'coin': prediction_data.get('coin', 'BTC'),
+            'notes': prediction_data.get('notes'),
+            'validated_at': _parse_iso(prediction_data['validated_at']) if prediction_data.get('validated_at') else None
+        }
+    
+    def _save_predictions_bulk_db(self, predictions: List[Dict]) -> bool:
+        """Save predictions to database with a Core executemany INSERT (no ORM unit of work)"""
         try:
-            session = self.get_session()
-            
-            # Create prediction record with simplified structure
-            record = PredictionRecord(
-                date=prediction_data.get('date'),
-                time=prediction_data.get('time'),
-                timestamp=datetime.fromisoformat(prediction_data.get('timestamp').replace('Z', '+00:00')) if prediction_data.get('timestamp') else datetime.utcnow(),
-                method=prediction_data.get('method'),
-                entry_level=prediction_data.get('entry_level'),
-                stop_loss=prediction_data.get('stop_loss'),
-                take_profit=prediction_data.get('take_profit'),
-                confidence=prediction_data.get('confidence'),
-                accuracy=prediction_data.get('accuracy'),  # Initially None/empty
-                coin=prediction_data.get('coin', 'BTC'),
-                notes=prediction_data.get('notes'),
-                validated_at=datetime.fromisoformat(prediction_data.get('validated_at').replace('Z', '+00:00')) if prediction_data.get('validated_at') else None
-            )
+            rows = [self._prediction_row(prediction) for prediction in predictions]
             
-            session.add(record)
-            session.commit()
-            session.close()
-            logger.info("Prediction saved to database successfully")
+            with self.engine.begin() as conn:
+                conn.execute(insert(PredictionRecord.__table__), rows)
+            
+            logger.info(f"Saved {len(rows)} prediction(s) to database successfully")
             return True
             
         except Exception as e:
-            logger.error(f"Error saving prediction to database: {e}")
-            if 'session' in locals():
-                session.rollback()
-                session.close()
+            logger.error(f"Error saving predictions to database: {e}")
             return False
     
+    def _save_prediction_db(self, prediction_data: Dict) -> bool:
+        """Save prediction to database"""
+        return self._save_predictions_bulk_db([prediction_data])
+    
     def _save_prediction_json(self, prediction_data: Dict, filename: str) -> bool:
         """Save prediction to JSON file (fallback)"""
         try:
-            # Load existing data
-            if os.path.exists(filename):
-                with open(filename, 'r') as f:
-                    data = json.load(f)
-            else:
-                data = []
-            
-            # Add new prediction
-            data.append(prediction_data)
-            
-            # Save back to file
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=4, default=str)
+            # Add new prediction; the file is written behind by flush()
+            self._mem_append(filename, dict(prediction_data))
             
             logger.info(f"Prediction saved to {filename}")
             return True
@@ -241,67 +776,86 @@ class DatabaseManager:
     def load_predictions(self, limit: Optional[int] = None) -> List[Dict]:
         """Load predictions from database or JSON file"""
         if self.use_database:
-            return self._load_predictions_db(limit)
+            return self._cached_rows(('load_predictions', limit), lambda: self._load_predictions_db(limit))
         else:
-            return self._load_predictions_json("detailed_predictions.json", limit)
+            return self._load_predictions_json(PREDICTIONS_FILE, limit)
     
     def _load_predictions_db(self, limit: Optional[int] = None) -> List[Dict]:
         """Load predictions from database"""
         try:
-            session = self.get_session()
-            query = session.query(PredictionRecord).order_by(PredictionRecord.timestamp.desc())
-            
-            if limit:
-                query = query.limit(limit)
-            
-            records = query.all()
-            
-            predictions = []
-            for record in records:
-                prediction = {
-                    'date': record.date,
-                    'time': record.time,
-                    'timestamp': record.timestamp.isoformat() if record.timestamp else None,
-                    'method': record.method,
-                    'entry_level': record.entry_level,
-                    'stop_loss': record.stop_loss,
-                    'take_profit': record.take_profit,
-                    'confidence': record.confidence,
-                    'accuracy': record.accuracy,
-                    'coin': record.coin,
-                    'notes': record.notes,
-                    'validated_at': record.validated_at.isoformat() if record.validated_at else None
-                }
-                predictions.append(prediction)
-            
-            session.close()
-            return predictions
+            with self._session() as session:
+                stmt = _LOAD_PREDICTIONS_STMT.limit(limit) if limit else _LOAD_PREDICTIONS_STMT
+                predictions = [_row_to_dict(row) for row in session.execute(stmt).mappings()]
+                
+                return predictions
             
         except Exception as e:
             logger.error(f"Error loading predictions from database: {e}")
-            session.close()
             return []
     
     def _load_predictions_json(self, filename: str, limit: Optional[int] = None) -> List[Dict]:
         """Load predictions from JSON file (fallback)"""
         try:
-            if not os.path.exists(filename):
-                return []
-            
-            with open(filename, 'r') as f:
-                data = json.load(f)
-            
-            if limit:
-                data = data[-limit:]
-            
-            return data
+            with self._mem_lock:
+                data = self._mem_load(filename)
+                
+                if limit:
+                    data = data[-limit:]
+                
+                # Shallow copies: setting a field on a returned prediction doesn't
+                # reach the mirror, but nested lists and dicts are still shared
+                return [dict(prediction) for prediction in data]
             
         except Exception as e:
             logger.error(f"Error loading predictions from JSON: {e}")
             return []
     
+    def load_predictions_summary(self, limit: Optional[int] = None) -> List[Dict]:
+        """Load lightweight prediction rows (no levels or notes) for dashboards"""
+        if self.use_database:
+            return self._load_predictions_summary_db(limit)
+        else:
+            predictions = self._load_predictions_json(PREDICTIONS_FILE, limit)
+            return [{field: p.get(field) for field in self.SUMMARY_FIELDS} for p in predictions]
+    
+    def _load_predictions_summary_db(self, limit: Optional[int] = None) -> List[Dict]:
+        """Load prediction summary columns from database"""
+        try:
+            with self._session() as session:
+                stmt = select(
+                    PredictionRecord.date,
+                    PredictionRecord.time,
+                    PredictionRecord.timestamp,
+                    PredictionRecord.method,
+                    PredictionRecord.confidence,
+                    PredictionRecord.accuracy,
+                    PredictionRecord.coin
+                ).order_by(PredictionRecord.timestamp.desc()).execution_options(yield_per=1000)
+                
+                if limit:
+                    stmt = stmt.limit(limit)
+                
+                predictions = []
+                for row in session.execute(stmt):
+                    predictions.append({
+                        'date': row.date,
+                        'time': row.time,
+                        'timestamp': row.timestamp.isoformat() if row.timestamp else None,
+                        'method': row.method,
+                        'confidence': row.confidence,
+                        'accuracy': row.accuracy,
+                        'coin': row.coin
+                    })
+                
+                return predictions
+            
+        except Exception as e:
+            logger.error(f"Error loading prediction summary from database: {e}")
+            return []
+    
     def update_prediction_validation(self, prediction_id: str, validation_points: List[Dict], accuracy: float = None) -> bool:
         """Update prediction validation data"""
+        self.invalidate_cache()
         if self.use_database:
             return self._update_prediction_validation_db(prediction_id, validation_points, accuracy)
         else:
@@ -310,62 +864,124 @@ class DatabaseManager:
     def _update_prediction_validation_db(self, prediction_id: str, validation_points: List[Dict], accuracy: float = None) -> bool:
         """Update prediction validation in database"""
         try:
-            session = self.get_session()
-            
-            # Find prediction by timestamp (using as ID for JSON compatibility)
-            record = session.query(PredictionRecord).filter(
-                PredictionRecord.timestamp == datetime.fromisoformat(prediction_id.replace('Z', '+00:00'))
-            ).first()
-            
-            if record:
-                record.validation_points = validation_points
-                record.validated_at = datetime.utcnow()
-                if accuracy is not None:
-                    record.accuracy = accuracy
+            with self._session() as session:
+                # Find prediction by timestamp (using as ID for JSON compatibility)
+                record = session.query(PredictionRecord).filter(
+                    PredictionRecord.timestamp == _parse_iso(prediction_id)
+                ).first()
                 
-                session.commit()
-                session.close()
-                return True
-            
-            session.close()
-            return False
+                if record:
+                    record.validation_points = validation_points
+                    record.validated_at = datetime.utcnow()
+                    if accuracy is not None:
+                        record.accuracy = accuracy
+                    
+                    return True
+                
+                return False
             
         except Exception as e:
             logger.error(f"Error updating prediction validation in database: {e}")
-            session.rollback()
-            session.close()
             return False
     
     def _update_prediction_validation_json(self, prediction_id: str, validation_points: List[Dict], accuracy: float = None) -> bool:
         """Update prediction validation in JSON file"""
         try:
-            filename = "detailed_predictions.json"
-            if not os.path.exists(filename):
-                return False
+            filename = PREDICTIONS_FILE
+            
+            with self._mem_lock:
+                data = self._mem_load(filename)
+                if not data:
+                    return False
+                
+                # Find and update prediction (unknown ids fail, like the database path)
+                prediction = self._mem_find(filename, prediction_id)
+                if prediction is None:
+                    return False
+                
+                prediction['validation_points'] = validation_points
+                prediction['validated_at'] = datetime.utcnow().isoformat()
+                if accuracy is not None:
+                    prediction['accuracy'] = accuracy
+                self._mem_mark_dirty(filename)
             
-            with open(filename, 'r') as f:
-                data = json.load(f)
+            return True
             
-            # Find and update prediction
-            for prediction in data:
-                if prediction.get('timestamp') == prediction_id:
+        except Exception as e:
+            logger.error(f"Error updating prediction validation in JSON: {e}")
+            return False
+    
+    def bulk_update_validation(self, items: List[Tuple[str, List[Dict], Optional[float]]]) -> bool:
+        """Update validation data for many predictions at once.
+        
+        Each item is (prediction_id, validation_points, accuracy), the same
+        arguments update_prediction_validation takes for a single prediction.
+        """
+        if not items:
+            return True
+        self.invalidate_cache()
+        if self.use_database:
+            return self._bulk_update_validation_db(items)
+        else:
+            return self._bulk_update_validation_json(items)
+    
+    def _bulk_update_validation_db(self, items: List[Tuple[str, List[Dict], Optional[float]]]) -> bool:
+        """Update validation for many predictions with one executemany UPDATE"""
+        try:
+            with self._session() as session:
+                table = PredictionRecord.__table__
+                
+                stmt = update(table).where(
+                    table.c.timestamp == bindparam('ts')
+                ).values(
+                    validation_points=bindparam('vp', type_=table.c.validation_points.type),
+                    accuracy=func.coalesce(bindparam('acc'), table.c.accuracy),
+                    validated_at=bindparam('va')
+                )
+                
+                now = datetime.utcnow()
+                params = [
+                    {'ts': _parse_iso(prediction_id), 'vp': validation_points, 'acc': accuracy, 'va': now}
+                    for prediction_id, validation_points, accuracy in items
+                ]
+                
+                session.execute(stmt, params)
+                return True
+            
+        except Exception as e:
+            logger.error(f"Error bulk updating prediction validation in database: {e}")
+            return False
+    
+    def _bulk_update_validation_json(self, items: List[Tuple[str, List[Dict], Optional[float]]]) -> bool:
+        """Update validation for many predictions in the JSON mirror with one flush"""
+        try:
+            filename = PREDICTIONS_FILE
+            validated_at = datetime.utcnow().isoformat()
+            
+            with self._mem_lock:
+                if not self._mem_load(filename):
+                    return False
+                
+                for prediction_id, validation_points, accuracy in items:
+                    prediction = self._mem_find(filename, prediction_id)
+                    if prediction is None:
+                        continue
                     prediction['validation_points'] = validation_points
-                    prediction['validated_at'] = datetime.utcnow().isoformat()
+                    prediction['validated_at'] = validated_at
                     if accuracy is not None:
                         prediction['accuracy'] = accuracy
-                    break
-            
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=4, default=str)
+                
+                self._mem_mark_dirty(filename)
             
             return True
             
         except Exception as e:
-            logger.error(f"Error updating prediction validation in JSON: {e}")
+            logger.error(f"Error bulk updating prediction validation in JSON: {e}")
             return False
     
     def save_learning_insight(self, insight_type: str, period: str, data: Dict) -> bool:
         """Save learning insight"""
+        self.invalidate_cache()
         if self.use_database:
             return self._save_learning_insight_db(insight_type, period, data)
         else:
@@ -374,58 +990,63 @@ class DatabaseManager:
     def _save_learning_insight_db(self, insight_type: str, period: str, data: Dict) -> bool:
         """Save learning insight to database"""
         try:
-            session = self.get_session()
+            dialect_insert = sqlite_insert if self.engine.dialect.name == 'sqlite' else pg_insert
+            now = datetime.utcnow()
             
-            # Check if insight already exists
-            existing = session.query(LearningInsight).filter(
-                LearningInsight.insight_type == insight_type,
-                LearningInsight.period == period
-            ).first()
-            
-            if existing:
-                existing.data = data
-                existing.updated_at = datetime.utcnow()
-            else:
-                insight = LearningInsight(
-                    insight_type=insight_type,
-                    period=period,
-                    data=data
-                )
-                session.add(insight)
+            # Single atomic upsert on the (insight_type, period) unique index, NULL periods included
+            stmt = dialect_insert(LearningInsight).values(
+                insight_type=insight_type,
+                period=period,
+                data=data,
+                created_at=now,
+                updated_at=now
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(INSIGHT_KEY),
+                set_={'data': stmt.excluded.data, 'updated_at': now}
+            )
             
-            session.commit()
-            session.close()
-            return True
+            with self._session() as session:
+                if self._insight_upsert:
+                    session.execute(stmt)
+                    return True
+                
+                # No unique index yet (see _ensure_insight_unique_index): update the newest match or insert
+                existing_id = session.execute(
+                    select(LearningInsight.id)
+                    .where(INSIGHT_KEY[0] == insight_type, INSIGHT_KEY[1] == (period if period is not None else ''))
+                    .order_by(LearningInsight.id.desc())
+                    .limit(1)
+                ).scalar()
+                if existing_id is None:
+                    session.execute(insert(LearningInsight).values(
+                        insight_type=insight_type, period=period, data=data, created_at=now, updated_at=now
+                    ))
+                else:
+                    session.execute(
+                        update(LearningInsight).where(LearningInsight.id == existing_id).values(data=data, updated_at=now)
+                    )
+                return True
             
         except Exception as e:
             logger.error(f"Error saving learning insight to database: {e}")
-            session.rollback()
-            session.close()
             return False
     
     def _save_learning_insight_json(self, insight_type: str, period: str, data: Dict) -> bool:
-        """Save learning insight to JSON file"""
+        """Save learning insight to its own JSON file"""
         try:
-            filename = "deep_learning_insights.json"
+            self._migrate_legacy_insights()
             
-            # Load existing insights
-            if os.path.exists(filename):
-                with open(filename, 'r') as f:
-                    insights = json.load(f)
-            else:
-                insights = {}
-            
-            # Update or add insight
-            key = f"{insight_type}_{period}"
-            insights[key] = {
-                'insight_type': insight_type,
-                'period': period,
-                'data': data,
-                'updated_at': datetime.utcnow().isoformat()
-            }
+            filename = _insight_path(insight_type, period)
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
             
-            with open(filename, 'w') as f:
-                json.dump(insights, f, indent=4, default=str)
+            with _file_lock(filename):
+                _write_json_atomic(filename, {
+                    'insight_type': insight_type,
+                    'period': period,
+                    'data': data,
+                    'updated_at': datetime.utcnow().isoformat()
+                })
             
             return True
             
@@ -433,65 +1054,119 @@ class DatabaseManager:
             logger.error(f"Error saving learning insight to JSON: {e}")
             return False
     
-    def get_learning_insights(self, insight_type: Optional[str] = None) -> List[Dict]:
-        """Get learning insights"""
-        if self.use_database:
-            return self._get_learning_insights_db(insight_type)
-        else:
-            return self._get_learning_insights_json(insight_type)
+    def get_learning_insights(self, insight_type: Optional[str] = None, limit: int = 500) -> List[Dict]:
+        """Get learning insights (newest first, at most `limit` rows)"""
+        return self._cached_rows(
+            ('get_learning_insights', self.use_database, insight_type, limit),
+            lambda: self._get_learning_insights_db(insight_type, limit) if self.use_database
+            else self._get_learning_insights_json(insight_type, limit)
+        )
     
-    def _get_learning_insights_db(self, insight_type: Optional[str] = None) -> List[Dict]:
+    def _get_learning_insights_db(self, insight_type: Optional[str] = None, limit: int = 500) -> List[Dict]:
         """Get learning insights from database"""
         try:
-            session = self.get_session()
-            query = session.query(LearningInsight)
-            
-            if insight_type:
-                query = query.filter(LearningInsight.insight_type == insight_type)
-            
-            records = query.order_by(LearningInsight.updated_at.desc()).all()
-            
-            insights = []
-            for record in records:
-                insight = {
-                    'insight_type': record.insight_type,
-                    'period': record.period,
-                    'data': record.data,
-                    'updated_at': record.updated_at.isoformat() if record.updated_at else None
-                }
-                insights.append(insight)
-            
-            session.close()
-            return insights
+            with self._session() as session:
+                stmt = _LEARNING_INSIGHTS_STMT
+                if insight_type:
+                    stmt = stmt.where(LearningInsight.insight_type == insight_type)
+                
+                insights = [_row_to_dict(row) for row in session.execute(stmt.limit(limit)).mappings()]
+                
+                return insights
             
         except Exception as e:
             logger.error(f"Error getting learning insights from database: {e}")
-            session.close()
             return []
     
-    def _get_learning_insights_json(self, insight_type: Optional[str] = None) -> List[Dict]:
-        """Get learning insights from JSON file"""
+    def _migrate_legacy_insights(self):
+        """Split the legacy single-file insight store into per-insight files (once)"""
+        if os.path.isdir(INSIGHTS_DIR):
+            return
+        legacy_path = _resolve_json_path(LEGACY_INSIGHTS_FILE)
+        if legacy_path is None:
+            return
+        
+        legacy = _read_json(legacy_path)
+        # validation_script.py writes a list of analyses to the same filename; only
+        # the keyed dict format belongs to this store
+        if not isinstance(legacy, dict):
+            return
+        
+        for insight in legacy.values():
+            filename = _insight_path(insight.get('insight_type'), insight.get('period'))
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            _write_json_atomic(filename, insight)
+        logger.info(f"Migrated {len(legacy)} insights from {legacy_path} to {INSIGHTS_DIR}/")
+    
+    def _get_learning_insights_json(self, insight_type: Optional[str] = None, limit: int = 500) -> List[Dict]:
+        """Get learning insights from JSON files"""
         try:
-            filename = "deep_learning_insights.json"
-            if not os.path.exists(filename):
-                return []
-            
-            with open(filename, 'r') as f:
-                insights = json.load(f)
+            self._migrate_legacy_insights()
             
+            # Only the requested type's directory is read
             result = []
-            for key, insight in insights.items():
-                if not insight_type or insight.get('insight_type') == insight_type:
-                    result.append(insight)
+            for filename in _list_insight_files(insight_type or None):
+                path = _resolve_json_path(filename)
+                if path:
+                    result.append(_read_json(path))
             
-            return result
+            # Match the database ordering: newest first
+            result.sort(key=lambda insight: insight.get('updated_at') or '', reverse=True)
+            return result[:limit]
             
         except Exception as e:
             logger.error(f"Error getting learning insights from JSON: {e}")
             return []
     
-    def health_check(self) -> Dict[str, Any]:
-        """Check database health and return status"""
+    def get_insights_containing(self, fragment: Dict, limit: int = 500) -> List[Dict]:
+        """Get learning insights whose data contains `fragment` (jsonb `@>` semantics)"""
+        if self.use_database:
+            return self._get_insights_containing_db(fragment, limit)
+        else:
+            insights = self._get_learning_insights_json(limit=sys.maxsize)
+            return [insight for insight in insights if _json_contains(insight.get('data'), fragment)][:limit]
+    
+    def _get_insights_containing_db(self, fragment: Dict, limit: int = 500) -> List[Dict]:
+        """Get learning insights by data containment from database"""
+        try:
+            with self._session() as session:
+                if self.engine.dialect.name == 'postgresql':
+                    # Resolved by the GIN index on learning_insights.data
+                    stmt = _LEARNING_INSIGHTS_STMT.where(LearningInsight.data.contains(fragment)).limit(limit)
+                    rows = session.execute(stmt).mappings().all()
+                else:
+                    # No containment operator on SQLite - filter client-side
+                    rows = [
+                        row for row in session.execute(_LEARNING_INSIGHTS_STMT).mappings()
+                        if _json_contains(row['data'], fragment)
+                    ][:limit]
+                
+                insights = [_row_to_dict(row) for row in rows]
+                
+                return insights
+            
+        except Exception as e:
+            logger.error(f"Error getting learning insights by content from database: {e}")
+            return []
+    
+    def _count_rows(self, session: Session, model, exact: bool) -> int:
+        """Count rows in a table, using the planner estimate on PostgreSQL unless exact"""
+        if not exact and self.engine.dialect.name == 'postgresql':
+            estimate = session.execute(
+                text("SELECT reltuples::BIGINT FROM pg_class WHERE relname = :t"),
+                {'t': model.__tablename__}
+            ).scalar()
+            # reltuples is -1 (or missing) until the table has been analyzed
+            if estimate is not None and estimate >= 0:
+                return int(estimate)
+        return session.query(model).count()
+    
+    def health_check(self, exact: bool = False) -> Dict[str, Any]:
+        """Check database health and return status.
+        
+        Row counts are cached for READ_CACHE_TTL seconds and are planner
+        estimates on PostgreSQL; pass exact=True to force COUNT(*).
+        """
         status = {
             'database_available': self.use_database,
             'connection_type': 'database' if self.use_database else 'json_files',
@@ -503,40 +1178,36 @@ class DatabaseManager:
         
         if self.use_database:
             try:
-                from sqlalchemy import inspect
-                session = self.get_session()
-                
-                # Check if tables exist using modern SQLAlchemy inspector
-                inspector = inspect(self.engine)
-                status['tables_exist'] = inspector.has_table('predictions')
+                # Set once create_all has run in initialize_database
+                status['tables_exist'] = self._tables_exist
                 
                 # Count records
                 if status['tables_exist']:
-                    status['total_predictions'] = session.query(PredictionRecord).count()
-                    status['total_insights'] = session.query(LearningInsight).count()
-                
-                session.close()
+                    hit, counts = self._cache_get(('health_counts',))
+                    if exact or not hit:
+                        with self._session() as session:
+                            counts = (
+                                self._count_rows(session, PredictionRecord, exact),
+                                self._count_rows(session, LearningInsight, exact)
+                            )
+                        self._cache_put(('health_counts',), counts)
+                    status['total_predictions'], status['total_insights'] = counts
                 
             except Exception as e:
                 status['error'] = str(e)
         
         else:
             # Check JSON files
-            if os.path.exists('detailed_predictions.json'):
-                try:
-                    with open('detailed_predictions.json', 'r') as f:
-                        data = json.load(f)
-                        status['total_predictions'] = len(data)
-                except:
-                    pass
+            try:
+                status['total_predictions'] = len(self._mem_load(PREDICTIONS_FILE))
+            except:
+                pass
             
-            if os.path.exists('deep_learning_insights.json'):
-                try:
-                    with open('deep_learning_insights.json', 'r') as f:
-                        data = json.load(f)
-                        status['total_insights'] = len(data)
-                except:
-                    pass
+            try:
+                self._migrate_legacy_insights()
+                status['total_insights'] = len(_list_insight_files())
+            except:
+                pass
         
         return status
     
@@ -561,38 +1232,89 @@ class DatabaseManager:
     
     def update_prediction_accuracy(self, prediction_id: int, accuracy: float) -> bool:
         """Update the accuracy field for a specific prediction"""
+        self.invalidate_cache()
         if self.use_database:
             try:
-                session = self.get_session()
-                record = session.query(PredictionRecord).filter(PredictionRecord.id == prediction_id).first()
-                
-                if record:
-                    record.accuracy = accuracy
-                    record.validated_at = datetime.utcnow()
-                    session.commit()
-                    session.close()
-                    logger.info(f"Updated accuracy for prediction {prediction_id}: {accuracy}")
-                    return True
-                else:
-                    logger.warning(f"Prediction {prediction_id} not found")
-                    session.close()
-                    return False
+                with self._session() as session:
+                    record = session.get(PredictionRecord, prediction_id)
+                    
+                    if record:
+                        record.accuracy = accuracy
+                        record.validated_at = datetime.utcnow()
+                        logger.info(f"Updated accuracy for prediction {prediction_id}: {accuracy}")
+                        return True
+                    else:
+                        logger.warning(f"Prediction {prediction_id} not found")
+                        return False
                     
             except Exception as e:
                 logger.error(f"Error updating prediction accuracy: {e}")
-                if 'session' in locals():
-                    session.rollback()
-                    session.close()
                 return False
         else:
             logger.warning("Database not available for accuracy update")
             return False
     
+    def update_prediction_accuracies(self, updates: Dict[int, float]) -> int:
+        """Update the accuracy of many predictions at once
+        
+        Args:
+            updates: Mapping of prediction id -> accuracy
+            
+        Returns:
+            Number of predictions updated
+        """
+        if not updates:
+            return 0
+        
+        if not self.use_database:
+            logger.warning("Database not available for accuracy update")
+            return 0
+        
+        self.invalidate_cache()
+        try:
+            with self._session() as session:
+                table = PredictionRecord.__table__
+                
+                # Core UPDATE rather than ORM bulk-by-primary-key: unknown ids are
+                # skipped instead of failing the whole batch
+                stmt = update(table).where(
+                    table.c.id == bindparam('pid')
+                ).values(
+                    accuracy=bindparam('acc'),
+                    validated_at=bindparam('va')
+                )
+                
+                now = datetime.utcnow()
+                params = [
+                    {'pid': prediction_id, 'acc': accuracy, 'va': now}
+                    for prediction_id, accuracy in updates.items()
+                ]
+                
+                updated = session.execute(stmt, params).rowcount
+            
+            if updated < len(params):
+                logger.warning(f"{len(params) - updated} of {len(params)} predictions not found")
+            logger.info(f"Updated accuracy for {updated} predictions")
+            return updated
+            
+        except Exception as e:
+            logger.error(f"Error updating prediction accuracies: {e}")
+            return 0
+    
     def get_predictions_by_method(self, method: str, limit: int = 50) -> List[Dict]:
         """Get predictions filtered by method (ai or calculation)"""
         if self.use_database:
-            try:
-                session = self.get_session()
+            return self._cached_rows(
+                ('get_predictions_by_method', method, limit),
+                lambda: self._get_predictions_by_method_db(method, limit)
+            )
+        else:
+            return []
+    
+    def _get_predictions_by_method_db(self, method: str, limit: int = 50) -> List[Dict]:
+        """Get predictions filtered by method from database"""
+        try:
+            with self._session() as session:
                 query = session.query(PredictionRecord).filter(
                     PredictionRecord.method == method
                 ).order_by(PredictionRecord.timestamp.desc()).limit(limit)
@@ -617,16 +1339,43 @@ class DatabaseManager:
                     }
                     predictions.append(prediction)
                 
-                session.close()
                 return predictions
-                
-            except Exception as e:
-                logger.error(f"Error getting predictions by method: {e}")
-                if 'session' in locals():
-                    session.close()
-                return []
-        else:
+            
+        except Exception as e:
+            logger.error(f"Error getting predictions by method: {e}")
             return []
 
-# Global database manager instance
-db_manager = DatabaseManager() 
\ No newline at end of file
+_db_manager_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _shared_db_manager() -> DatabaseManager:
+    return DatabaseManager()
+
+def get_db_manager() -> DatabaseManager:
+    """Return the shared DatabaseManager, creating it on first call
+    
+    Call get_db_manager.cache_clear() to get a fresh instance (e.g. in tests).
+    """
+    # lru_cache doesn't serialise concurrent first calls, so the first
+    # construction happens under the lock; later calls skip it
+    if _shared_db_manager.cache_info().currsize == 0:
+        with _db_manager_lock:
+            return _shared_db_manager()
+    return _shared_db_manager()
+
+get_db_manager.cache_clear = _shared_db_manager.cache_clear
+
+class _LazyDatabaseManager:
+    """Stand-in for the global DatabaseManager that connects on first use"""
+    
+    def __getattr__(self, name):
+        # Introspection (pytest collection, copy, pickle) probes dunders; don't connect for those
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
+        return getattr(get_db_manager(), name)
+    
+    def __setattr__(self, name, value):
+        setattr(get_db_manager(), name, value)
+
+# Global database manager instance (initialized on first attribute access)
+db_manager = _LazyDatabaseManager()
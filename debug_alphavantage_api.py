@@ -5,287 +5,518 @@ This script tests the AlphaVantage API endpoints used in the crypto prediction s
 """
 
 import os
-import requests
+import sys
+import time
+import hashlib
+import bisect
+import asyncio
+import httpx
 import json
+import logging
+from functools import lru_cache
+from typing import NamedTuple
+from aiolimiter import AsyncLimiter
+
+# orjson parses the raw response bytes directly; json.loads accepts bytes too
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 from datetime import datetime
-from dotenv import load_dotenv
+from env_utils import load_env_once, ENV_LOADED, ENV_NO_DOTENV
+
+# Plain report lines on stdout
+logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+log = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(".cache", "alphavantage")
+
+# How long a cached response stays fresh, by interval (monthly CPI changes once a day at most)
+CACHE_TTLS = {
+    "daily": 3600,
+    "monthly": 86400,
+    "quarterly": 86400,
+    "annual": 86400,
+}
+
+class FileCache:
+    """On-disk cache of raw API response bodies, one file per key, expired by file age"""
+    
+    def __init__(self, directory=CACHE_DIR, enabled=True):
+        self.directory = directory
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+    
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+    
+    def get(self, key, ttl):
+        """Return the cached value for `key` if it is younger than `ttl` seconds"""
+        if not self.enabled:
+            return None
+        
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) <= ttl:
+                with open(path, "rb") as f:
+                    value = f.read()
+                self.hits += 1
+                return value
+        except OSError:
+            pass
+        
+        self.misses += 1
+        return None
+    
+    def set(self, key, value):
+        """Store `value` under `key` (written atomically)"""
+        if not self.enabled:
+            return
+        
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+
+CACHE = FileCache()
+
+# AlphaVantage free tier: 5 requests per minute
+LIMITER = AsyncLimiter(5, 60)
+MAX_RETRIES = 3
+
+# Live requests sent (each one spends a LIMITER token) and responses that came
+# back rate limited (HTTP 429 or an AlphaVantage "Note")
+live_request_count = 0
+rate_limited_count = 0
+
+async def fetch_with_retry(session, url, params):
+    """GET through the rate limiter, backing off and retrying on HTTP 429"""
+    global live_request_count, rate_limited_count
+    
+    for attempt in range(MAX_RETRIES + 1):
+        async with LIMITER:
+            live_request_count += 1
+            response = await session.get(url, params=params)
+            status_code = response.status_code
+            body = response.content
+            retry_after = response.headers.get("Retry-After")
+        
+        if status_code != 429:
+            return status_code, body
+        
+        rate_limited_count += 1
+        if attempt == MAX_RETRIES:
+            break
+        
+        delay = min(60, 2 ** attempt)
+        if retry_after and retry_after.isdigit():
+            delay = min(60, int(retry_after))
+        await asyncio.sleep(delay)
+    
+    return status_code, body
+
+ALPHAVANTAGE_URL = "https://www.alphavantage.co/query"
+PLACEHOLDER_API_KEY = "YOUR_ALPHAVANTAGE_API_KEY"
+
+# Set once by main() after the environment is loaded; None when unset or a placeholder
+API_KEY = None
+
+def read_api_key():
+    """Return the configured AlphaVantage key, or None if it is missing or the placeholder"""
+    api_key = os.getenv("ALPHAVANTAGE_API_KEY")
+    if not api_key or api_key == PLACEHOLDER_API_KEY:
+        return None
+    return api_key
+
+@lru_cache(maxsize=None)
+def query_params(function_name, interval, api_key):
+    """Query string for one probe, built once per (function, interval)"""
+    return (
+        ("function", function_name),
+        ("interval", interval),
+        ("apikey", api_key),
+    )
 
 def load_env():
     """Load environment variables"""
-    try:
-        if os.path.exists('.env'):
-            load_dotenv()
-            print("[INFO] Loaded configuration from .env file")
-        else:
-            print("[INFO] No .env file found, using environment variables")
-    except ImportError:
-        print("[INFO] python-dotenv not available, using environment variables only")
+    status = load_env_once()
+    if status == ENV_LOADED:
+        log.info("[INFO] Loaded configuration from .env file")
+    elif status == ENV_NO_DOTENV:
+        log.info("[INFO] python-dotenv not available, using environment variables only")
+    else:
+        log.info("[INFO] No .env file found, using environment variables")
 
-def test_alphavantage_endpoint(function_name, interval="monthly", description=""):
-    """Test a specific AlphaVantage endpoint"""
-    api_key = os.getenv("ALPHAVANTAGE_API_KEY")
+async def test_alphavantage_endpoint(session, function_name, interval="monthly", description=""):
+    """Test a specific AlphaVantage endpoint
     
-    if not api_key or api_key == "YOUR_ALPHAVANTAGE_API_KEY":
-        print(f"❌ {function_name}: API key not configured")
+    The request is awaited before anything is printed, so each endpoint's
+    report comes out as one block even when several run concurrently.
+    """
+    global rate_limited_count
+    
+    if not API_KEY:
+        log.info(f"❌ {function_name}: API key not configured")
         return None
     
-    print(f"\n🔍 Testing {function_name} - {description}")
-    print(f"   API Key: {api_key[:8]}...{api_key[-4:]}")
+    url = ALPHAVANTAGE_URL
+    params = query_params(function_name, interval, API_KEY)
     
-    url = "https://www.alphavantage.co/query"
-    params = {
-        "function": function_name,
-        "interval": interval,
-        "apikey": api_key
-    }
+    cache_key = hashlib.md5(f"{function_name}|{interval}".encode()).hexdigest()
+    body = CACHE.get(cache_key, CACHE_TTLS.get(interval, 3600))
+    from_cache = body is not None
     
-    try:
-        print(f"   URL: {url}")
-        print(f"   Params: {params}")
-        
-        response = requests.get(url, params=params, timeout=30)
-        print(f"   Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            try:
-                data = response.json()
-                print(f"   Response Keys: {list(data.keys())}")
-                
-                # Check for error messages
-                if "Error Message" in data:
-                    print(f"   ❌ Error: {data['Error Message']}")
-                    return None
-                
-                if "Note" in data:
-                    print(f"   ⚠️ Note: {data['Note']}")
-                
-                if "Information" in data:
-                    print(f"   ℹ️ Information: {data['Information']}")
-                
-                # Check for data structure
-                if "data" in data:
-                    data_array = data["data"]
-                    if isinstance(data_array, list) and len(data_array) > 0:
-                        print(f"   ✅ Data available: {len(data_array)} records")
-                        print(f"   📅 Date range: {data_array[0].get('date', 'N/A')} to {data_array[-1].get('date', 'N/A')}")
-                        print(f"   📊 Sample record: {data_array[0]}")
-                        return data
-                    else:
-                        print(f"   ❌ Data array is empty or invalid")
-                        return None
+    error = None
+    if from_cache:
+        status_code = 200
+    else:
+        try:
+            status_code, body = await fetch_with_retry(session, url, params)
+        except httpx.TimeoutException:
+            error = "Request timeout"
+        except httpx.HTTPError as e:
+            error = f"Request error: {e}"
+    
+    log.info(f"\n🔍 Testing {function_name} - {description}")
+    log.info(f"   API Key: {API_KEY[:8]}...{API_KEY[-4:]}")
+    log.info(f"   URL: {url}")
+    log.info(f"   Params: {dict(params)}")
+    if from_cache:
+        log.info(f"   💾 Served from cache ({CACHE.directory})")
+    
+    if error:
+        log.info(f"   ❌ {error}")
+        return None
+    
+    log.info(f"   Status Code: {status_code}")
+    
+    if status_code == 200:
+        try:
+            data = _loads(body)
+            log.info(f"   Response Keys: {list(data.keys())}")
+            
+            # Check for error messages
+            if "Error Message" in data:
+                log.info(f"   ❌ Error: {data['Error Message']}")
+                return None
+            
+            if "Note" in data:
+                rate_limited_count += 1
+                log.info(f"   ⚠️ Note: {data['Note']}")
+            
+            if "Information" in data:
+                log.info(f"   ℹ️ Information: {data['Information']}")
+            
+            # Check for data structure
+            if "data" in data:
+                data_array = data["data"]
+                if isinstance(data_array, list) and len(data_array) > 0:
+                    log.info(f"   ✅ Data available: {len(data_array)} records")
+                    log.info(f"   📅 Date range: {data_array[0].get('date', 'N/A')} to {data_array[-1].get('date', 'N/A')}")
+                    log.info(f"   📊 Sample record: {data_array[0]}")
+                    # Only good responses are cached; errors and rate-limit notes are retried next run
+                    if not from_cache:
+                        CACHE.set(cache_key, body)
+                    return data
                 else:
-                    print(f"   ❌ No 'data' key in response")
-                    print(f"   📄 Full response: {json.dumps(data, indent=2)[:500]}...")
+                    log.info(f"   ❌ Data array is empty or invalid")
                     return None
-                    
-            except json.JSONDecodeError as e:
-                print(f"   ❌ JSON decode error: {e}")
-                print(f"   📄 Raw response: {response.text[:500]}...")
+            else:
+                log.info(f"   ❌ No 'data' key in response")
+                log.info(f"   📄 Full response: {json.dumps(data, indent=2)[:500]}...")
                 return None
-        else:
-            print(f"   ❌ HTTP error: {response.status_code}")
-            print(f"   📄 Response: {response.text[:500]}...")
+                
+        except json.JSONDecodeError as e:
+            log.info(f"   ❌ JSON decode error: {e}")
+            log.info(f"   📄 Raw response: {body[:500].decode(errors='replace')}...")
             return None
-            
-    except requests.exceptions.Timeout:
-        print(f"   ❌ Request timeout")
-        return None
-    except requests.exceptions.RequestException as e:
-        print(f"   ❌ Request error: {e}")
+    else:
+        log.info(f"   ❌ HTTP error: {status_code}")
+        log.info(f"   📄 Response: {body[:500].decode(errors='replace')}...")
         return None
 
-def test_inflation_data():
-    """Test inflation data endpoint"""
-    print("\n" + "="*60)
-    print("📈 TESTING INFLATION DATA (CPI)")
-    print("="*60)
-    
-    data = test_alphavantage_endpoint("CPI", "monthly", "Consumer Price Index")
+class CPIRecord(NamedTuple):
+    """One CPI observation with its date and value already parsed"""
+    date: str
+    day: int        # proleptic ordinal of `date`
+    value: float
+
+def parse_cpi_records(data_array):
+    """Parse raw {"date", "value"} dicts once, skipping undated or missing (".") values"""
+    records = []
+    for record in data_array:
+        try:
+            day = datetime.strptime(record["date"], "%Y-%m-%d").toordinal()
+            records.append(CPIRecord(record["date"], day, float(record["value"])))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return records
+
+def test_inflation_data(data):
+    """Analyse the inflation data (CPI) response"""
+    log.info("\n" + "="*60)
+    log.info("📈 TESTING INFLATION DATA (CPI)")
+    log.info("="*60)
     
     if data and "data" in data:
         data_array = data["data"]
         if data_array:
             # Calculate year-over-year inflation
             try:
-                latest = data_array[0]
+                records = parse_cpi_records(data_array)
+                latest = records[0] if records else None
                 year_ago = None
                 
-                # Find data from 12 months ago
-                for record in data_array:
-                    if record.get("date"):
-                        record_date = datetime.strptime(record["date"], "%Y-%m-%d")
-                        latest_date = datetime.strptime(latest["date"], "%Y-%m-%d")
-                        if (latest_date - record_date).days >= 365:
-                            year_ago = record
-                            break
+                # Find data from 12 months ago. Records are newest first, so the
+                # negated day numbers ascend and can be binary searched.
+                if latest:
+                    day_keys = [-record.day for record in records]
+                    idx = bisect.bisect_left(day_keys, -(latest.day - 365))
+                    if idx < len(records):
+                        year_ago = records[idx]
                 
                 if year_ago:
-                    latest_cpi = float(latest["value"])
-                    year_ago_cpi = float(year_ago["value"])
-                    yoy_inflation = ((latest_cpi - year_ago_cpi) / year_ago_cpi) * 100
+                    yoy_inflation = ((latest.value - year_ago.value) / year_ago.value) * 100
                     
-                    print(f"   ✅ Inflation calculation successful:")
-                    print(f"      Latest CPI: {latest_cpi} ({latest['date']})")
-                    print(f"      Year ago CPI: {year_ago_cpi} ({year_ago['date']})")
-                    print(f"      YoY Inflation: {yoy_inflation:.2f}%")
+                    log.info(f"   ✅ Inflation calculation successful:")
+                    log.info(f"      Latest CPI: {latest.value} ({latest.date})")
+                    log.info(f"      Year ago CPI: {year_ago.value} ({year_ago.date})")
+                    log.info(f"      YoY Inflation: {yoy_inflation:.2f}%")
                 else:
-                    print(f"   ⚠️ Not enough historical data for YoY calculation")
+                    log.info(f"   ⚠️ Not enough historical data for YoY calculation")
             except Exception as e:
-                print(f"   ❌ Inflation calculation error: {e}")
+                log.info(f"   ❌ Inflation calculation error: {e}")
     
     return data
 
-def test_interest_rates():
-    """Test interest rates endpoints"""
-    print("\n" + "="*60)
-    print("💰 TESTING INTEREST RATES")
-    print("="*60)
-    
-    # Test Fed Funds Rate
-    print("\n🔍 Testing Fed Funds Rate...")
-    fed_data = test_alphavantage_endpoint("FEDERAL_FUNDS_RATE", "daily", "Federal Funds Rate")
-    
-    # Test 10-Year Treasury Yield
-    print("\n🔍 Testing 10-Year Treasury Yield...")
-    treasury_data = test_alphavantage_endpoint("TREASURY_YIELD", "daily", "10-Year Treasury Yield")
+def test_interest_rates(fed_data, treasury_data):
+    """Analyse the Fed Funds Rate and 10-Year Treasury Yield responses"""
+    log.info("\n" + "="*60)
+    log.info("💰 TESTING INTEREST RATES")
+    log.info("="*60)
     
     # Analyze results
     if fed_data and treasury_data:
-        print(f"\n📊 Interest Rates Analysis:")
+        log.info(f"\n📊 Interest Rates Analysis:")
         
         if "data" in fed_data and fed_data["data"]:
             fed_rate = fed_data["data"][0]["value"]
             fed_date = fed_data["data"][0]["date"]
-            print(f"   ✅ Fed Rate: {fed_rate}% ({fed_date})")
+            log.info(f"   ✅ Fed Rate: {fed_rate}% ({fed_date})")
         else:
-            print(f"   ❌ Fed Rate: No data available")
+            log.info(f"   ❌ Fed Rate: No data available")
         
         if "data" in treasury_data and treasury_data["data"]:
             treasury_yield = treasury_data["data"][0]["value"]
             treasury_date = treasury_data["data"][0]["date"]
-            print(f"   ✅ 10Y Treasury: {treasury_yield}% ({treasury_date})")
+            log.info(f"   ✅ 10Y Treasury: {treasury_yield}% ({treasury_date})")
         else:
-            print(f"   ❌ 10Y Treasury: No data available")
+            log.info(f"   ❌ 10Y Treasury: No data available")
     
     return fed_data, treasury_data
 
 def test_api_limits():
-    """Test API rate limits and quotas"""
-    print("\n" + "="*60)
-    print("⏱️ TESTING API LIMITS")
-    print("="*60)
+    """Report quota use for this run from the probes already made (no extra requests)"""
+    log.info("\n" + "="*60)
+    log.info("⏱️ TESTING API LIMITS")
+    log.info("="*60)
     
-    api_key = os.getenv("ALPHAVANTAGE_API_KEY")
-    if not api_key or api_key == "YOUR_ALPHAVANTAGE_API_KEY":
-        print("❌ API key not configured - cannot test limits")
-        return
-    
-    # Test multiple rapid requests to check rate limiting
-    print("🔄 Testing rapid requests...")
+    # Requests are paced by LIMITER, so a rate-limit response means the quota is
+    # tighter than expected (or already used up by another client on this key)
+    log.info(f"🔄 Requests paced at {LIMITER.max_rate:g} per {LIMITER.time_period:g}s")
+    log.info(f"   📡 Live requests: {live_request_count} (cache hits: {CACHE.hits})")
     
-    for i in range(3):
-        print(f"\n   Request {i+1}/3:")
-        data = test_alphavantage_endpoint("CPI", "monthly", f"Rate limit test {i+1}")
-        if data is None:
-            print(f"   ⚠️ Request {i+1} failed - possible rate limiting")
-        else:
-            print(f"   ✅ Request {i+1} successful")
+    if rate_limited_count:
+        log.info(f"   ⚠️ {rate_limited_count} response(s) were rate limited - quota may be exhausted")
+    else:
+        log.info(f"   ✅ No rate-limited responses")
 
-def test_alternative_endpoints():
-    """Test alternative AlphaVantage endpoints that might work better"""
-    print("\n" + "="*60)
-    print("🔄 TESTING ALTERNATIVE ENDPOINTS")
-    print("="*60)
+def test_alternative_endpoints(results_by_interval):
+    """Report which CPI intervals work, in order of preference"""
+    log.info("\n" + "="*60)
+    log.info("🔄 TESTING ALTERNATIVE ENDPOINTS")
+    log.info("="*60)
     
     # Test different intervals
-    intervals = ["monthly", "quarterly", "annual"]
-    for interval in intervals:
-        print(f"\n🔍 Testing CPI with {interval} interval...")
-        data = test_alphavantage_endpoint("CPI", interval, f"CPI {interval}")
+    for interval in CPI_INTERVALS:
+        log.info(f"\n🔍 Testing CPI with {interval} interval...")
+        if interval not in results_by_interval:
+            log.info(f"   ⏭️ {interval} interval skipped - another interval already works")
+            continue
+        
+        data = results_by_interval[interval]
         if data and "data" in data and data["data"]:
-            print(f"   ✅ {interval} interval works")
+            log.info(f"   ✅ {interval} interval works")
             break
         else:
-            print(f"   ❌ {interval} interval failed")
+            log.info(f"   ❌ {interval} interval failed")
+
+# Independent probes, fired concurrently: name -> (function, interval, description)
+ENDPOINTS = {
+    "inflation": ("CPI", "monthly", "Consumer Price Index"),
+    "fed": ("FEDERAL_FUNDS_RATE", "daily", "Federal Funds Rate"),
+    "treasury": ("TREASURY_YIELD", "daily", "10-Year Treasury Yield"),
+}
+
+# CPI intervals in order of preference; monthly is the inflation probe above
+CPI_INTERVALS = ["monthly", "quarterly", "annual"]
 
-def main():
+async def scan_cpi_intervals(session, monthly_task):
+    """Probe the fallback CPI intervals alongside monthly, stopping once any interval works
+    
+    Returns {interval: data} for every interval that ran to completion;
+    cancelled fallbacks are left out.
+    """
+    tasks = {"monthly": monthly_task}
+    for interval in CPI_INTERVALS[1:]:
+        tasks[interval] = asyncio.create_task(
+            test_alphavantage_endpoint(session, "CPI", interval, f"CPI {interval}")
+        )
+    
+    for next_done in asyncio.as_completed(list(tasks.values())):
+        try:
+            data = await next_done
+        except Exception:
+            continue
+        if data and data.get("data"):
+            # The monthly task is the inflation probe, so only the fallbacks are cancelled
+            for interval, task in tasks.items():
+                if interval != "monthly":
+                    task.cancel()
+            break
+    
+    outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    return {
+        interval: None if isinstance(outcome, BaseException) else outcome
+        for interval, outcome in zip(tasks, outcomes)
+        if not isinstance(outcome, asyncio.CancelledError)
+    }
+
+async def fetch_all_endpoints():
+    """Run every endpoint probe concurrently over one HTTP/2 connection
+    
+    AlphaVantage speaks HTTP/2, so the concurrent probes are multiplexed as
+    streams on a single TLS connection instead of one connection each.
+    """
+    limits = httpx.Limits(max_keepalive_connections=10)
+    async with httpx.AsyncClient(http2=True, timeout=30, limits=limits) as session:
+        tasks = {
+            name: asyncio.create_task(test_alphavantage_endpoint(session, function_name, interval, description))
+            for name, (function_name, interval, description) in ENDPOINTS.items()
+        }
+        cpi_intervals = await scan_cpi_intervals(session, tasks["inflation"])
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    
+    # A probe that blew up counts as a failed probe
+    results = {
+        name: None if isinstance(result, BaseException) else result
+        for name, result in zip(tasks, results)
+    }
+    results["cpi_intervals"] = cpi_intervals
+    return results
+
+async def main():
     """Main test function"""
-    print("🧪 ALPHAVANTAGE API DEBUG SCRIPT")
-    print("="*60)
-    print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    global API_KEY
+    
+    log.info("🧪 ALPHAVANTAGE API DEBUG SCRIPT")
+    log.info("="*60)
+    log.info(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     # Load environment
     load_env()
     
+    if "--no-cache" in sys.argv:
+        CACHE.enabled = False
+        log.info("[INFO] Response cache disabled (--no-cache)")
+    
     # Test API key
-    api_key = os.getenv("ALPHAVANTAGE_API_KEY")
-    if not api_key or api_key == "YOUR_ALPHAVANTAGE_API_KEY":
-        print("\n❌ ALPHAVANTAGE_API_KEY not configured!")
-        print("   Set the environment variable: ALPHAVANTAGE_API_KEY=your_key_here")
-        print("   Get a free key at: https://www.alphavantage.co/support/#api-key")
+    API_KEY = read_api_key()
+    if not API_KEY:
+        log.info("\n❌ ALPHAVANTAGE_API_KEY not configured!")
+        log.info("   Set the environment variable: ALPHAVANTAGE_API_KEY=your_key_here")
+        log.info("   Get a free key at: https://www.alphavantage.co/support/#api-key")
         return
     
-    print(f"\n✅ API Key found: {api_key[:8]}...{api_key[-4:]}")
+    log.info(f"\n✅ API Key found: {API_KEY[:8]}...{API_KEY[-4:]}")
     
     # Run tests
     try:
+        log.info("\n🚀 Querying all endpoints concurrently...")
+        results = await fetch_all_endpoints()
+        
         # Test inflation data
-        inflation_data = test_inflation_data()
+        inflation_data = results["inflation"]
+        test_inflation_data(inflation_data)
         
         # Test interest rates
-        fed_data, treasury_data = test_interest_rates()
+        fed_data, treasury_data = results["fed"], results["treasury"]
+        test_interest_rates(fed_data, treasury_data)
         
         # Test API limits
         test_api_limits()
         
         # Test alternative endpoints
-        test_alternative_endpoints()
+        test_alternative_endpoints(results["cpi_intervals"])
         
         # Summary
-        print("\n" + "="*60)
-        print("📋 TEST SUMMARY")
-        print("="*60)
+        log.info("\n" + "="*60)
+        log.info("📋 TEST SUMMARY")
+        log.info("="*60)
         
         success_count = 0
         total_tests = 3
         
         if inflation_data and "data" in inflation_data and inflation_data["data"]:
-            print("✅ Inflation data: WORKING")
+            log.info("✅ Inflation data: WORKING")
             success_count += 1
         else:
-            print("❌ Inflation data: FAILED")
+            log.info("❌ Inflation data: FAILED")
         
         if fed_data and "data" in fed_data and fed_data["data"]:
-            print("✅ Fed Funds Rate: WORKING")
+            log.info("✅ Fed Funds Rate: WORKING")
             success_count += 1
         else:
-            print("❌ Fed Funds Rate: FAILED")
+            log.info("❌ Fed Funds Rate: FAILED")
         
         if treasury_data and "data" in treasury_data and treasury_data["data"]:
-            print("✅ Treasury Yield: WORKING")
+            log.info("✅ Treasury Yield: WORKING")
             success_count += 1
         else:
-            print("❌ Treasury Yield: FAILED")
+            log.info("❌ Treasury Yield: FAILED")
         
-        print(f"\n📊 Success Rate: {success_count}/{total_tests} ({success_count/total_tests*100:.1f}%)")
+        log.info(f"\n📊 Success Rate: {success_count}/{total_tests} ({success_count/total_tests*100:.1f}%)")
+        if CACHE.enabled:
+            log.info(f"💾 Cache: {CACHE.hits} hits, {CACHE.misses} misses")
         
         if success_count == 0:
-            print("\n🚨 ALL TESTS FAILED - Possible issues:")
-            print("   • API key invalid or expired")
-            print("   • API quota exceeded")
-            print("   • Network connectivity issues")
-            print("   • AlphaVantage service down")
+            log.info("\n🚨 ALL TESTS FAILED - Possible issues:")
+            log.info("   • API key invalid or expired")
+            log.info("   • API quota exceeded")
+            log.info("   • Network connectivity issues")
+            log.info("   • AlphaVantage service down")
         elif success_count < total_tests:
-            print(f"\n⚠️  PARTIAL FAILURE - {total_tests - success_count} endpoint(s) not working")
-            print("   • Check specific endpoint errors above")
-            print("   • Consider using fallback data sources")
+            log.info(f"\n⚠️  PARTIAL FAILURE - {total_tests - success_count} endpoint(s) not working")
+            log.info("   • Check specific endpoint errors above")
+            log.info("   • Consider using fallback data sources")
         else:
-            print("\n🎉 ALL TESTS PASSED - AlphaVantage API is working correctly!")
+            log.info("\n🎉 ALL TESTS PASSED - AlphaVantage API is working correctly!")
         
     except Exception as e:
-        print(f"\n💥 CRITICAL ERROR: {e}")
-        import traceback
-        traceback.print_exc()
+        # Traceback goes through the same (buffered) stream as the report
+        log.exception(f"\n💥 CRITICAL ERROR: {e}")
 
 if __name__ == "__main__":
-    main()
+    # When piped, block-buffer stdout so the many small report lines go out in
+    # batches; logging.shutdown() flushes at the end. A terminal keeps line
+    # buffering so progress shows during rate-limit waits and slow requests
+    if not sys.stdout.isatty():
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    try:
+        asyncio.run(main())
+    finally:
+        logging.shutdown()
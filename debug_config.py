@@ -2,7 +2,14 @@
 
 import os
 import json
-from dotenv import load_dotenv
+from env_utils import load_env_once, ENV_LOADED
+from telegram_utils import SESSION
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 def debug_config():
     """Debug the configuration loading in main script"""
@@ -10,7 +17,7 @@ def debug_config():
     print("=" * 50)
     
     # Load environment variables
-    load_dotenv()
+    load_env_once()
     
     print("1️⃣ Environment Variables:")
     env_vars = [
@@ -27,12 +34,20 @@ def debug_config():
         else:
             print(f"   ❌ {var}: Not set")
     
-    print("\n2️⃣ Config.json file:")
+    # Read and parse config.json once; both checks below work from this copy
+    file_config = None
+    file_error = None
     if os.path.exists("config.json"):
         try:
-            with open("config.json", "r") as f:
-                config = json.load(f)
-            
+            with open("config.json", "rb") as f:
+                file_config = _loads(f.read())
+        except Exception as e:
+            file_error = e
+    
+    print("\n2️⃣ Config.json file:")
+    if file_config is not None:
+        try:
+            config = file_config
             telegram_config = config.get("telegram", {})
             print(f"   telegram.enabled: {telegram_config.get('enabled')}")
             
@@ -49,6 +64,8 @@ def debug_config():
             
         except Exception as e:
             print(f"   ❌ Error reading config.json: {e}")
+    elif file_error is not None:
+        print(f"   ❌ Error reading config.json: {file_error}")
     else:
         print("   ❌ config.json not found")
     
@@ -72,22 +89,22 @@ def debug_config():
     }
     
     # Load existing config if it exists (but skip sensitive data)
-    if os.path.exists("config.json"):
+    if file_config is not None:
         try:
-            with open("config.json", "r") as f:
-                existing_config = json.load(f)
-                # Update config with existing values, but exclude sensitive data
-                for key, value in existing_config.items():
-                    if key in config:
-                        if key == "telegram":
-                            # Skip telegram section - will be loaded from env vars
-                            continue
-                        elif isinstance(value, dict) and isinstance(config[key], dict):
-                            config[key].update(value)
-                        else:
-                            config[key] = value
+            # Update config with existing values, but exclude sensitive data
+            for key, value in file_config.items():
+                if key in config:
+                    if key == "telegram":
+                        # Skip telegram section - will be loaded from env vars
+                        continue
+                    elif isinstance(value, dict) and isinstance(config[key], dict):
+                        config[key].update(value)
+                    else:
+                        config[key] = value
         except Exception as e:
             print(f"   ❌ Error loading existing config: {e}")
+    elif file_error is not None:
+        print(f"   ❌ Error loading existing config: {file_error}")
     
     # NOW load sensitive data from environment variables (ALWAYS takes priority)
     config["telegram"]["bot_token"] = os.getenv("TELEGRAM_BOT_TOKEN", "")
@@ -129,11 +146,13 @@ def debug_config():
         return False
     
     print("\n5️⃣ Quick test with final config:")
-    import requests
+    
+    # Both checks go through the shared keep-alive SESSION, so getChat reuses
+    # the connection (and TLS handshake) opened by getMe
+    api_base = f"https://api.telegram.org/bot{final_bot_token}"
     
     try:
-        url = f"https://api.telegram.org/bot{final_bot_token}/getMe"
-        response = requests.get(url)
+        response = SESSION.get(f"{api_base}/getMe", timeout=10)
         if response.status_code == 200:
             print("   ✅ Bot token is valid")
         else:
@@ -144,9 +163,7 @@ def debug_config():
         return False
     
     try:
-        url = f"https://api.telegram.org/bot{final_bot_token}/getChat"
-        params = {"chat_id": final_chat_id}
-        response = requests.get(url, params=params)
+        response = SESSION.get(f"{api_base}/getChat", params={"chat_id": final_chat_id}, timeout=10)
         if response.status_code == 200:
             print("   ✅ Chat access is valid")
             return True
@@ -166,11 +183,10 @@ def debug_production_config():
     if os.path.exists('.env'):
         print("✓ .env file exists (local development)")
         try:
-            from dotenv import load_dotenv
-            load_dotenv()
-            print("✓ .env file loaded successfully")
-        except ImportError:
-            print("⚠ python-dotenv not installed - using system environment variables")
+            if load_env_once() == ENV_LOADED:
+                print("✓ .env file loaded successfully")
+            else:
+                print("⚠ python-dotenv not installed - using system environment variables")
         except Exception as e:
             print(f"⚠ Error loading .env file: {e}")
     else:
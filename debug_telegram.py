@@ -1,23 +1,25 @@
 #!/usr/bin/env python3
 
 import os
-try:
-    from dotenv import load_dotenv
-    DOTENV_AVAILABLE = True
-except ImportError:
-    DOTENV_AVAILABLE = False
 
+from env_utils import load_env_once, ENV_LOADED, ENV_NO_DOTENV
 from telegram_utils import TelegramBot
 
 # Load environment variables if available
-if os.path.exists('.env') and DOTENV_AVAILABLE:
-    load_dotenv()
+env_status = load_env_once()
+if env_status == ENV_LOADED:
     print("✓ Loaded .env file for local development")
-elif os.path.exists('.env') and not DOTENV_AVAILABLE:
+elif env_status == ENV_NO_DOTENV:
     print("⚠ .env file found but python-dotenv not installed - using system environment variables")
 else:
     print("No .env file found - using system environment variables (cloud deployment mode)")
 
+# One bot (and one pooled HTTP session) shared by every test
+BOT = TelegramBot(
+    bot_token=os.getenv("TEST_TELEGRAM_BOT_TOKEN"),
+    chat_id=os.getenv("TEST_TELEGRAM_CHAT_ID")
+)
+
 def test_env_loading():
     """Test if environment variables are loading correctly"""
     print("\nTesting environment variable loading...")
@@ -45,25 +47,15 @@ def test_simple_message():
     """Test sending a simple message without complex formatting"""
     print("\nTesting simple message...")
     
-    bot = TelegramBot(
-        bot_token=os.getenv("TEST_TELEGRAM_BOT_TOKEN"),
-        chat_id=os.getenv("TEST_TELEGRAM_CHAT_ID")
-    )
-    
     simple_message = "🔍 TEST MESSAGE\n\nThis is a simple test message to verify Telegram functionality."
     
-    success = bot.send_message(simple_message)
+    success = BOT.send_message(simple_message)
     return success
 
 def test_formatted_message():
     """Test sending a message with basic Markdown formatting"""
     print("\nTesting formatted message...")
     
-    bot = TelegramBot(
-        bot_token=os.getenv("TEST_TELEGRAM_BOT_TOKEN"),
-        chat_id=os.getenv("TEST_TELEGRAM_CHAT_ID")
-    )
-    
     formatted_message = """🔍 *CRYPTO ANALYSIS TEST*
 
 📊 *EXECUTIVE SUMMARY*
@@ -83,7 +75,7 @@ def test_formatted_message():
 
 ⚠️ *Risk Management: Use proper position sizing*"""
     
-    success = bot.send_message(formatted_message)
+    success = BOT.send_message(formatted_message)
     return success
 
 def main():
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Shared .env loading for the debug scripts
+The .env file is checked and parsed once per process, however many scripts ask for it
+"""
+
+import os
+from functools import lru_cache
+
+try:
+    from dotenv import load_dotenv
+    DOTENV_AVAILABLE = True
+except ImportError:
+    DOTENV_AVAILABLE = False
+
+# What load_env_once() found
+ENV_LOADED = "loaded"          # .env exists and was loaded
+ENV_NO_DOTENV = "no_dotenv"    # .env exists but python-dotenv is not installed
+ENV_NO_FILE = "no_file"        # no .env file - system environment variables only
+
+@lru_cache(maxsize=1)
+def load_env_once():
+    """Load .env into os.environ on the first call; later calls just return the status"""
+    if not os.path.exists('.env'):
+        return ENV_NO_FILE
+
+    if not DOTENV_AVAILABLE:
+        return ENV_NO_DOTENV
+
+    load_dotenv()
+    return ENV_LOADED
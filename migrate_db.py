@@ -3,14 +3,115 @@
 import os
 import logging
 import json
+import uuid
 from datetime import datetime
-from sqlalchemy import create_engine, text, MetaData, Table
+from functools import lru_cache
+from sqlalchemy import (
+    create_engine, text, MetaData, Table, Column,
+    Integer, String, Float, Boolean, DateTime, Text, JSON
+)
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.dialects.postgresql import JSONB
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Set up logging (LOG_LEVEL=DEBUG also dumps the full predictions schema)
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper(), format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Single definition of the predictions table - CREATE TABLE and the
+# ADD COLUMN migration are both generated from it
+metadata = MetaData()
+predictions_table = Table(
+    'predictions', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('date', String(20), nullable=False),
+    Column('session', String(20), nullable=False),
+    Column('timestamp', DateTime, nullable=False),
+    
+    # Market data fields
+    Column('btc_price', Float),
+    Column('eth_price', Float),
+    Column('btc_rsi', Float),
+    Column('eth_rsi', Float),
+    Column('fear_greed', Integer),
+    
+    # Prediction data, AI text and analysis
+    Column('predictions_data', JSON, nullable=False),
+    Column('ai_prediction', Text),
+    Column('professional_analysis', JSON),
+    Column('ml_predictions', JSON),
+    Column('risk_analysis', JSON),
+    
+    # Validation data
+    Column('validation_points', JSON, server_default=text("'[]'::json")),
+    Column('final_accuracy', Float),
+    
+    # Processing flags
+    Column('ml_processed', Boolean, server_default=text('FALSE')),
+    Column('hourly_validated', Boolean, server_default=text('FALSE')),
+    Column('last_validation', DateTime),
+    
+    # Enhanced fields for validation learning
+    Column('trade_metrics', JSON),
+    
+    # Detailed validation fields
+    Column('entry_hit', Boolean, server_default=text('FALSE')),
+    Column('entry_hit_time', DateTime),
+    Column('tp_hit', Boolean, server_default=text('FALSE')),
+    Column('tp_hit_time', DateTime),
+    Column('sl_hit', Boolean, server_default=text('FALSE')),
+    Column('sl_hit_time', DateTime),
+    Column('validation_status', String(20), server_default=text("'PENDING'")),
+    Column('validation_error', String(200)),
+    
+    # Additional metadata
+    Column('created_at', DateTime, server_default=text('CURRENT_TIMESTAMP')),
+    Column('updated_at', DateTime, server_default=text('CURRENT_TIMESTAMP')),
+)
+
+def _column_ddl(column):
+    """Render a column's type and server default for ALTER TABLE ADD COLUMN"""
+    ddl = column.type.compile(dialect=postgresql.dialect())
+    if column.server_default is not None:
+        ddl += f" DEFAULT {column.server_default.arg.text}"
+    return ddl
+
+# Columns that can be added to a populated table: everything except the
+# primary key and NOT NULL columns without a default
+ADDABLE_COLUMNS = {
+    column.name: _column_ddl(column)
+    for column in predictions_table.columns
+    if not column.primary_key and (column.nullable or column.server_default is not None)
+}
+
+# Indexes on the predictions table as (name, columns)
+PREDICTION_INDEXES = [
+    ("idx_predictions_timestamp", "timestamp"),
+    ("idx_predictions_date_session", "date, session"),
+    ("idx_predictions_validation_status", "validation_status"),
+    ("idx_predictions_hourly_validated", "hourly_validated"),
+]
+
+def prediction_index_sql(concurrently=False):
+    """Return the CREATE INDEX statements for the predictions table"""
+    option = "CONCURRENTLY " if concurrently else ""
+    return [
+        f"CREATE INDEX {option}IF NOT EXISTS {name} ON predictions({columns});"
+        for name, columns in PREDICTION_INDEXES
+    ]
+
+@lru_cache(maxsize=1)
+def _create_engine(database_url):
+    """Build the engine once per URL so every migration phase shares it"""
+    return create_engine(
+        database_url,
+        echo=False,
+        # One-shot script: no pool to keep healthy, so skip the pre-ping round-trip
+        poolclass=NullPool,
+        connect_args={"sslmode": "require"}
+    )
+
 def get_database_connection():
     """Get database connection with proper error handling"""
     try:
@@ -20,128 +121,59 @@ def get_database_connection():
             logger.error("DATABASE_URL environment variable not set")
             return None
             
-        # Fix for Render's PostgreSQL URL format
-        if database_url.startswith('postgres://'):
-            database_url = database_url.replace('postgres://', 'postgresql://', 1)
-        
-        # Create engine with enhanced settings
-        engine = create_engine(
-            database_url,
-            echo=False,
-            pool_pre_ping=True,
-            pool_recycle=300,
-            connect_args={"sslmode": "require"}
-        )
+        # Fix for Render's PostgreSQL URL format, pinning psycopg2 (the driver in
+        # requirements.txt) - SQLAlchemy 2.1 maps a bare postgresql:// to psycopg 3
+        for scheme in ('postgres://', 'postgresql://'):
+            if database_url.startswith(scheme):
+                database_url = 'postgresql+psycopg2://' + database_url[len(scheme):]
         
-        # Test connection
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-            logger.info("✅ Database connection successful")
-        
-        return engine
+        # Reuse the cached engine; the first checkout surfaces connection errors
+        return _create_engine(database_url)
         
     except Exception as e:
         logger.error(f"❌ Database connection failed: {e}")
         return None
 
-def check_table_exists(engine, table_name):
-    """Check if a table exists in the database"""
+def check_tables_exist(conn, table_names):
+    """Map each of table_names to whether it exists, using a single catalog query"""
     try:
-        with engine.connect() as conn:
-            result = conn.execute(text(f"""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = '{table_name}'
-                );
-            """))
-            exists = result.fetchone()[0]
+        result = conn.execute(text("""
+            SELECT table_name
+            FROM information_schema.tables 
+            WHERE table_name = ANY(:table_names);
+        """), {"table_names": list(table_names)})
+        existing = {row[0] for row in result.fetchall()}
+        tables = {table_name: table_name in existing for table_name in table_names}
+        for table_name, exists in tables.items():
             logger.info(f"Table '{table_name}' exists: {exists}")
-            return exists
+        return tables
     except Exception as e:
         logger.error(f"Error checking table existence: {e}")
-        return False
+        return {table_name: False for table_name in table_names}
+
+def check_table_exists(conn, table_name):
+    """Check if a table exists in the database"""
+    return check_tables_exist(conn, [table_name])[table_name]
 
-def create_predictions_table(engine):
+def create_predictions_table(conn):
     """Create the predictions table with all necessary fields"""
     try:
-        with engine.connect() as conn:
-            conn.execute(text("""
-                CREATE TABLE IF NOT EXISTS predictions (
-                    id SERIAL PRIMARY KEY,
-                    date VARCHAR(20) NOT NULL,
-                    session VARCHAR(20) NOT NULL,
-                    timestamp TIMESTAMP NOT NULL,
-                    
-                    -- Market data fields
-                    btc_price FLOAT,
-                    eth_price FLOAT,
-                    btc_rsi FLOAT,
-                    eth_rsi FLOAT,
-                    fear_greed INTEGER,
-                    
-                    -- Prediction data (JSON)
-                    predictions_data JSON NOT NULL,
-                    
-                    -- AI prediction text
-                    ai_prediction TEXT,
-                    
-                    -- Professional analysis (JSON)
-                    professional_analysis JSON,
-                    
-                    -- ML predictions (JSON)
-                    ml_predictions JSON,
-                    
-                    -- Risk analysis (JSON)
-                    risk_analysis JSON,
-                    
-                    -- Validation data
-                    validation_points JSON DEFAULT '[]'::json,
-                    final_accuracy FLOAT,
-                    
-                    -- Processing flags
-                    ml_processed BOOLEAN DEFAULT FALSE,
-                    hourly_validated BOOLEAN DEFAULT FALSE,
-                    last_validation TIMESTAMP,
-                    
-                    -- Enhanced fields for validation learning
-                    trade_metrics JSON,
-                    
-                    -- New fields for detailed validation
-                    entry_hit BOOLEAN DEFAULT FALSE,
-                    entry_hit_time TIMESTAMP,
-                    tp_hit BOOLEAN DEFAULT FALSE,
-                    tp_hit_time TIMESTAMP,
-                    sl_hit BOOLEAN DEFAULT FALSE,
-                    sl_hit_time TIMESTAMP,
-                    validation_status VARCHAR(20) DEFAULT 'PENDING',
-                    validation_error VARCHAR(200),
-                    
-                    -- Additional metadata
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-            """))
-            
-            # Create indexes for better performance
-            conn.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_predictions_timestamp ON predictions(timestamp);
-                CREATE INDEX IF NOT EXISTS idx_predictions_date_session ON predictions(date, session);
-                CREATE INDEX IF NOT EXISTS idx_predictions_validation_status ON predictions(validation_status);
-                CREATE INDEX IF NOT EXISTS idx_predictions_hourly_validated ON predictions(hourly_validated);
-            """))
-            
-            conn.commit()
-            logger.info("✅ Predictions table created successfully")
-            return True
-            
+        # CREATE TABLE is generated from predictions_table; indexes go in the same round-trip
+        create_sql = str(CreateTable(predictions_table, if_not_exists=True).compile(dialect=conn.dialect))
+        conn.execute(text(create_sql + ";\n" + "\n".join(prediction_index_sql())))
+        
+        logger.info("✅ Predictions table created successfully")
+        return True
+        
     except Exception as e:
         logger.error(f"❌ Failed to create predictions table: {e}")
         return False
 
-def create_learning_insights_table(engine):
+def create_learning_insights_table(conn):
     """Create the learning_insights table"""
     try:
-        with engine.connect() as conn:
+        # Savepoint: this table is optional, so a failure must not abort the migration
+        with conn.begin_nested():
             conn.execute(text("""
                 CREATE TABLE IF NOT EXISTS learning_insights (
                     id SERIAL PRIMARY KEY,
@@ -151,16 +183,13 @@ def create_learning_insights_table(engine):
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 );
-            """))
-            
-            # Create indexes
-            conn.execute(text("""
+                
+                -- Indexes go in the same round-trip
                 CREATE INDEX IF NOT EXISTS idx_learning_insights_type ON learning_insights(insight_type);
                 CREATE INDEX IF NOT EXISTS idx_learning_insights_period ON learning_insights(period);
                 CREATE INDEX IF NOT EXISTS idx_learning_insights_created ON learning_insights(created_at);
             """))
             
-            conn.commit()
             logger.info("✅ Learning insights table created successfully")
             return True
             
@@ -168,142 +197,145 @@ def create_learning_insights_table(engine):
         logger.error(f"❌ Failed to create learning insights table: {e}")
         return False
 
-def migrate_existing_columns(engine):
-    """Add new columns to existing predictions table"""
+def dedupe_learning_insights(conn):
+    """Remove duplicate learning insights and add the unique index the app's upsert relies on
+    
+    The old select-then-insert save could store several rows per insight type and
+    period; the newest row (highest id) of each is kept. NULL periods count as one
+    key, matching the COALESCE in the index.
+    """
     try:
-        with engine.connect() as conn:
-            # Check existing columns first
-            result = conn.execute(text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = 'predictions'
-            """))
-            existing_columns = {row[0] for row in result.fetchall()}
-            logger.info(f"Existing columns: {sorted(existing_columns)}")
-            
-            # Define all required columns with their SQL types
-            required_columns = {
-                'ai_prediction': 'TEXT',
-                'professional_analysis': 'JSON',
-                'ml_predictions': 'JSON',
-                'risk_analysis': 'JSON',
-                'entry_hit': 'BOOLEAN DEFAULT FALSE',
-                'entry_hit_time': 'TIMESTAMP',
-                'tp_hit': 'BOOLEAN DEFAULT FALSE',
-                'tp_hit_time': 'TIMESTAMP',
-                'sl_hit': 'BOOLEAN DEFAULT FALSE',
-                'sl_hit_time': 'TIMESTAMP',
-                'validation_status': 'VARCHAR(20) DEFAULT \'PENDING\'',
-                'validation_error': 'VARCHAR(200)',
-                'created_at': 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP',
-                'updated_at': 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'
-            }
-            
-            # Add missing columns
-            added_columns = []
-            for column_name, column_type in required_columns.items():
-                if column_name not in existing_columns:
-                    try:
-                        conn.execute(text(f"""
-                            ALTER TABLE predictions 
-                            ADD COLUMN {column_name} {column_type};
-                        """))
-                        added_columns.append(column_name)
-                        logger.info(f"✅ Added column: {column_name}")
-                    except Exception as e:
-                        logger.warning(f"⚠️ Failed to add column {column_name}: {e}")
-            
-            # Create/update indexes
-            index_queries = [
-                "CREATE INDEX IF NOT EXISTS idx_predictions_timestamp ON predictions(timestamp);",
-                "CREATE INDEX IF NOT EXISTS idx_predictions_date_session ON predictions(date, session);",
-                "CREATE INDEX IF NOT EXISTS idx_predictions_validation_status ON predictions(validation_status);",
-                "CREATE INDEX IF NOT EXISTS idx_predictions_hourly_validated ON predictions(hourly_validated);"
-            ]
-            
-            for query in index_queries:
-                try:
-                    conn.execute(text(query))
-                except Exception as e:
-                    logger.warning(f"⚠️ Index creation warning: {e}")
-            
-            conn.commit()
+        # Savepoint: the insights table is optional, so a failure must not abort the migration
+        with conn.begin_nested():
+            removed = conn.execute(text("""
+                DELETE FROM learning_insights
+                WHERE id NOT IN (
+                    SELECT MAX(id) FROM learning_insights
+                    GROUP BY insight_type, COALESCE(period, '')
+                );
+            """)).rowcount
             
-            if added_columns:
-                logger.info(f"✅ Migration completed successfully. Added {len(added_columns)} columns: {added_columns}")
+            if removed:
+                logger.info(f"🧹 Removed {removed} duplicate learning insights (kept the newest of each)")
             else:
-                logger.info("✅ All columns already exist. No migration needed.")
+                logger.info("🧹 No duplicate learning insights found")
             
+            # Replaces the earlier (insight_type, period) index, which let NULL periods repeat
+            conn.execute(text("""
+                CREATE UNIQUE INDEX IF NOT EXISTS uq_learning_insights_type_period
+                    ON learning_insights (insight_type, COALESCE(period, ''));
+                DROP INDEX IF EXISTS uq_insight_type_period;
+            """))
+            
+            logger.info("✅ Learning insights unique index in place")
             return True
             
+    except Exception as e:
+        logger.error(f"❌ Failed to dedupe learning insights: {e}")
+        return False
+
+def migrate_existing_columns(conn, create_indexes=True):
+    """Add new columns to existing predictions table"""
+    try:
+        # One ALTER TABLE generated from predictions_table; PostgreSQL skips
+        # the columns that already exist
+        clauses = ", ".join(
+            f"ADD COLUMN IF NOT EXISTS {name} {column_ddl}"
+            for name, column_ddl in ADDABLE_COLUMNS.items()
+        )
+        conn.execute(text(f"ALTER TABLE predictions {clauses};"))
+        
+        # Create/update indexes in a single round-trip; populated tables get
+        # theirs from create_indexes_concurrently() after the commit instead
+        if create_indexes:
+            conn.execute(text("\n".join(prediction_index_sql())))
+        
+        logger.info(f"✅ Migration completed successfully. Ensured {len(ADDABLE_COLUMNS)} columns: {list(ADDABLE_COLUMNS)}")
+        
+        return True
+        
     except Exception as e:
         logger.error(f"❌ Migration failed: {e}")
         return False
 
-def validate_database_schema(engine):
+def create_indexes_concurrently(engine):
+    """Build the predictions indexes without blocking writes on a populated table"""
+    try:
+        # CONCURRENTLY can't run inside a transaction block, so use autocommit
+        # and send one statement at a time
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for query in prediction_index_sql(concurrently=True):
+                conn.execute(text(query))
+        logger.info("✅ Predictions indexes built concurrently")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Concurrent index creation failed: {e}")
+        return False
+
+def validate_database_schema(conn):
     """Validate that all required fields are present"""
     try:
-        with engine.connect() as conn:
-            # Get current schema
+        # The full schema dump is debug output; the check itself only needs names
+        if logger.isEnabledFor(logging.DEBUG):
             result = conn.execute(text("""
                 SELECT column_name, data_type, is_nullable, column_default
                 FROM information_schema.columns 
                 WHERE table_name = 'predictions'
                 ORDER BY ordinal_position;
             """))
-            
             columns = result.fetchall()
-            logger.info("📋 Current database schema:")
-            for col in columns:
-                logger.info(f"  {col[0]} ({col[1]}) - Nullable: {col[2]} - Default: {col[3]}")
-            
-            # Check for required core fields
-            required_core_fields = [
-                'id', 'date', 'session', 'timestamp', 'btc_price', 'eth_price',
-                'predictions_data', 'validation_points', 'entry_hit', 'tp_hit',
-                'sl_hit', 'validation_status'
-            ]
-            
-            column_names = {col[0] for col in columns}
-            missing_fields = [field for field in required_core_fields if field not in column_names]
+            logger.debug("📋 Current database schema:\n" + "\n".join(
+                f"  {col[0]} ({col[1]}) - Nullable: {col[2]} - Default: {col[3]}" for col in columns
+            ))
+        else:
+            result = conn.execute(text("""
+                SELECT column_name
+                FROM information_schema.columns 
+                WHERE table_name = 'predictions';
+            """))
+            columns = result.fetchall()
+        
+        # Check for required core fields
+        required_core_fields = {
+            'id', 'date', 'session', 'timestamp', 'btc_price', 'eth_price',
+            'predictions_data', 'validation_points', 'entry_hit', 'tp_hit',
+            'sl_hit', 'validation_status'
+        }
+        
+        missing_fields = sorted(required_core_fields - {col[0] for col in columns})
+        
+        if missing_fields:
+            logger.error(f"❌ Missing required fields: {missing_fields}")
+            return False
+        else:
+            logger.info("✅ All required fields are present")
+            return True
             
-            if missing_fields:
-                logger.error(f"❌ Missing required fields: {missing_fields}")
-                return False
-            else:
-                logger.info("✅ All required fields are present")
-                return True
-                
     except Exception as e:
         logger.error(f"❌ Schema validation failed: {e}")
         return False
 
-def backup_existing_data(engine):
-    """Create a backup of existing data before migration"""
+def backup_existing_data(conn):
+    """Snapshot the predictions schema into a timestamped table before migration
+    
+    The migration only adds nullable columns and indexes, all inside one
+    transaction, so existing rows are never rewritten; a schema-only copy
+    records the pre-migration layout without copying the table.
+    """
     try:
-        with engine.connect() as conn:
-            # Check if there's any data to backup
-            result = conn.execute(text("SELECT COUNT(*) FROM predictions"))
-            row_count = result.fetchone()[0]
+        # Savepoint so a failed snapshot is reported instead of aborting the shared transaction
+        with conn.begin_nested():
+            # Random suffix so two runs in the same second don't collide
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_table = f"predictions_backup_{timestamp}_{uuid.uuid4().hex[:8]}"
+            
+            # Columns and CHECK constraints only - no rows, indexes or id sequence default
+            conn.execute(text(f"CREATE TABLE {backup_table} (LIKE predictions INCLUDING CONSTRAINTS);"))
+            
+            logger.info(f"✅ Created schema backup table: {backup_table}")
+            return True
             
-            if row_count > 0:
-                logger.info(f"📦 Found {row_count} existing records")
-                
-                # Create backup table
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_table = f"predictions_backup_{timestamp}"
-                
-                conn.execute(text(f"""
-                    CREATE TABLE {backup_table} AS 
-                    SELECT * FROM predictions;
-                """))
-                
-                logger.info(f"✅ Created backup table: {backup_table}")
-                return True
-            else:
-                logger.info("📦 No existing data to backup")
-                return True
-                
     except Exception as e:
         logger.error(f"❌ Backup failed: {e}")
         return False
@@ -318,44 +350,56 @@ def migrate_database():
         return False
     
     try:
-        # Check if predictions table exists
-        predictions_exist = check_table_exists(engine, 'predictions')
+        has_rows = False
         
-        if predictions_exist:
-            logger.info("📋 Predictions table exists, performing column migration...")
+        # One connection and one transaction for every migration phase; failures
+        # raise so begin() rolls back everything done so far
+        with engine.begin() as conn:
+            # Look up both tables in one information_schema round-trip
+            existing_tables = check_tables_exist(conn, ['predictions', 'learning_insights'])
+            
+            if existing_tables['predictions']:
+                logger.info("📋 Predictions table exists, performing column migration...")
+                
+                # Backup existing schema
+                if not backup_existing_data(conn):
+                    logger.warning("⚠️ Backup failed, but continuing with migration...")
+                
+                # Index builds would lock writes on a populated table, so only
+                # run them in this transaction while it is empty
+                has_rows = conn.execute(text("SELECT EXISTS (SELECT 1 FROM predictions)")).scalar()
+                
+                # Migrate existing columns
+                if not migrate_existing_columns(conn, create_indexes=not has_rows):
+                    raise RuntimeError("Column migration failed")
+            else:
+                logger.info("📋 Predictions table doesn't exist, creating new table...")
+                
+                # Create new table
+                if not create_predictions_table(conn):
+                    raise RuntimeError("Table creation failed")
             
-            # Backup existing data
-            if not backup_existing_data(engine):
-                logger.warning("⚠️ Backup failed, but continuing with migration...")
+            # Create learning insights table
+            if not existing_tables['learning_insights']:
+                if not create_learning_insights_table(conn):
+                    logger.warning("⚠️ Learning insights table creation failed")
             
-            # Migrate existing columns
-            if not migrate_existing_columns(engine):
-                logger.error("❌ Column migration failed")
-                return False
-        else:
-            logger.info("📋 Predictions table doesn't exist, creating new table...")
+            # One-time cleanup the app itself never does: it only deletes rows here
+            if not dedupe_learning_insights(conn):
+                logger.warning("⚠️ Learning insights keep using select-then-update saves")
             
-            # Create new table
-            if not create_predictions_table(engine):
-                logger.error("❌ Table creation failed")
-                return False
-        
-        # Create learning insights table
-        if not check_table_exists(engine, 'learning_insights'):
-            if not create_learning_insights_table(engine):
-                logger.warning("⚠️ Learning insights table creation failed")
-        
-        # Validate schema
-        if not validate_database_schema(engine):
-            logger.error("❌ Schema validation failed")
-            return False
-        
-        # Final connection test
-        with engine.connect() as conn:
+            # Validate schema - a table we just created from our own DDL needs no check
+            if existing_tables['predictions'] and not validate_database_schema(conn):
+                raise RuntimeError("Schema validation failed")
+            
+            # Final record count
             result = conn.execute(text("SELECT COUNT(*) FROM predictions"))
             record_count = result.fetchone()[0]
             logger.info(f"📊 Database has {record_count} prediction records")
         
+        if has_rows and not create_indexes_concurrently(engine):
+            logger.warning("⚠️ Index creation failed, but the schema migration was committed")
+        
         logger.info("🎉 Database migration completed successfully!")
         return True
         
@@ -371,7 +415,7 @@ def run_local_migration():
     
     try:
         # Import database manager to initialize local database
-        from database_manager import DatabaseManager
+        from database_manager import DatabaseManager, Base, PredictionRecord
         
         db_manager = DatabaseManager()
         if db_manager.use_database:
@@ -381,32 +425,23 @@ def run_local_migration():
             if 'sqlite' in str(db_manager.engine.url):
                 logger.info("🗄️ Local SQLite database detected")
                 
-                # For SQLite, we need to ensure all columns exist
-                # The DatabaseManager should handle this through SQLAlchemy
+                # Read-only check of the local columns against the model
+                required_columns = {column.name for column in PredictionRecord.__table__.columns}
+                column_query = text("SELECT name FROM pragma_table_info('predictions')")
                 with db_manager.get_session() as session:
-                    result = session.execute(text("SELECT name FROM sqlite_master WHERE type='table' AND name='predictions'"))
-                    if result.fetchone():
-                        logger.info("✅ Local predictions table exists")
-                    else:
-                        logger.info("📋 Local predictions table will be created by SQLAlchemy")
+                    local_columns = {row[0] for row in session.execute(column_query)}
                 
-                # Test a basic operation
-                test_prediction = {
-                    "date": "2025-01-01",
-                    "session": "test",
-                    "timestamp": datetime.now().isoformat(),
-                    "market_data": {"btc_price": 100000, "eth_price": 4000},
-                    "ai_prediction": "Test prediction",
-                    "professional_analysis": {"test": True},
-                    "validation_status": "PENDING"
-                }
+                if not local_columns:
+                    logger.info("📋 Local predictions table missing, creating it with SQLAlchemy")
+                    Base.metadata.create_all(bind=db_manager.engine)
+                    with db_manager.get_session() as session:
+                        local_columns = {row[0] for row in session.execute(column_query)}
                 
-                # Try saving and removing test prediction
-                success = db_manager.save_prediction(test_prediction)
-                if success:
-                    logger.info("✅ Local database format validation successful")
+                missing_columns = required_columns - local_columns
+                if missing_columns:
+                    logger.warning(f"⚠️ Local predictions table is missing columns: {sorted(missing_columns)}")
                 else:
-                    logger.warning("⚠️ Local database test failed")
+                    logger.info("✅ Local database format validation successful")
             else:
                 logger.info("🌐 Remote PostgreSQL database detected")
         else:
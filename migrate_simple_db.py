@@ -2,6 +2,7 @@
 
 import os
 import psycopg2
+from contextlib import closing
 from datetime import datetime
 
 def migrate_to_simple_schema():
@@ -19,77 +20,72 @@ def migrate_to_simple_schema():
     
     try:
         print("🔌 Connecting to PostgreSQL database...")
-        conn = psycopg2.connect(database_url)
-        cursor = conn.cursor()
+        # closing() closes the connection; the inner `with conn` commits on
+        # success and rolls back if anything below raises
+        with closing(psycopg2.connect(database_url)) as conn:
+            with conn, conn.cursor() as cursor:
+                # Drop old complex table if it exists
+                print("🗑️  Dropping old complex predictions table...")
+                cursor.execute("DROP TABLE IF EXISTS predictions CASCADE;")
         
-        # Drop old complex table if it exists
-        print("🗑️  Dropping old complex predictions table...")
-        cursor.execute("DROP TABLE IF EXISTS predictions CASCADE;")
-        
-        # Create new simple predictions table
-        print("📋 Creating new simple predictions table...")
-        cursor.execute("""
-            CREATE TABLE predictions (
-                id SERIAL PRIMARY KEY,
+                # Create new simple predictions table
+                print("📋 Creating new simple predictions table...")
+                cursor.execute("""
+                    CREATE TABLE predictions (
+                        id SERIAL PRIMARY KEY,
                 
-                -- Basic timing info
-                date VARCHAR(20) NOT NULL,
-                time VARCHAR(20) NOT NULL,
-                timestamp TIMESTAMP NOT NULL,
+                        -- Basic timing info
+                        date VARCHAR(20) NOT NULL,
+                        time VARCHAR(20) NOT NULL,
+                        timestamp TIMESTAMP NOT NULL,
                 
-                -- Prediction method
-                method VARCHAR(20) NOT NULL,  -- 'ai' or 'calculation'
+                        -- Prediction method
+                        method VARCHAR(20) NOT NULL,  -- 'ai' or 'calculation'
                 
-                -- Core prediction data
-                entry_level FLOAT NOT NULL,   -- Entry price
-                stop_loss FLOAT NOT NULL,     -- Stop loss price  
-                take_profit FLOAT NOT NULL,   -- Take profit price
-                confidence FLOAT NOT NULL,    -- Confidence 0-100
+                        -- Core prediction data
+                        entry_level FLOAT NOT NULL,   -- Entry price
+                        stop_loss FLOAT NOT NULL,     -- Stop loss price  
+                        take_profit FLOAT NOT NULL,   -- Take profit price
+                        confidence FLOAT NOT NULL,    -- Confidence 0-100
                 
-                -- Validation field (filled later)
-                accuracy FLOAT,               -- Actual accuracy (empty initially)
+                        -- Validation field (filled later)
+                        accuracy FLOAT,               -- Actual accuracy (empty initially)
                 
-                -- Optional metadata
-                coin VARCHAR(10) DEFAULT 'BTC',
-                notes VARCHAR(500),
+                        -- Optional metadata
+                        coin VARCHAR(10) DEFAULT 'BTC',
+                        notes VARCHAR(500),
                 
-                -- Timestamps
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                validated_at TIMESTAMP
-            );
-        """)
-        
-        # Create useful indexes for performance
-        print("🔍 Creating indexes...")
-        cursor.execute("CREATE INDEX idx_predictions_date ON predictions(date);")
-        cursor.execute("CREATE INDEX idx_predictions_method ON predictions(method);")
-        cursor.execute("CREATE INDEX idx_predictions_timestamp ON predictions(timestamp);")
-        
-        # Commit changes
-        conn.commit()
+                        -- Timestamps
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        validated_at TIMESTAMP
+                    );
+                """)
         
-        # Verify table creation
-        print("✅ Verifying table structure...")
-        cursor.execute("""
-            SELECT column_name, data_type, is_nullable 
-            FROM information_schema.columns 
-            WHERE table_name = 'predictions' 
-            ORDER BY ordinal_position;
-        """)
+                # Create useful indexes for performance
+                print("🔍 Creating indexes...")
+                cursor.execute("CREATE INDEX idx_predictions_date ON predictions(date);")
+                cursor.execute("CREATE INDEX idx_predictions_method ON predictions(method);")
+                cursor.execute("CREATE INDEX idx_predictions_timestamp ON predictions(timestamp);")
         
-        columns = cursor.fetchall()
-        print("   New table columns:")
-        for col in columns:
-            nullable = "NULL" if col[2] == "YES" else "NOT NULL"
-            print(f"   - {col[0]} ({col[1]}) {nullable}")
+                # Verify table creation
+                print("✅ Verifying table structure...")
+                cursor.execute("""
+                    SELECT column_name, data_type, is_nullable 
+                    FROM information_schema.columns 
+                    WHERE table_name = %s
+                    ORDER BY ordinal_position;
+                """, ('predictions',))
         
-        # Show row count (should be 0)
-        cursor.execute("SELECT COUNT(*) FROM predictions;")
-        count = cursor.fetchone()[0]
-        print(f"   Total rows: {count}")
+                columns = cursor.fetchall()
+                print("   New table columns:")
+                for col in columns:
+                    nullable = "NULL" if col[2] == "YES" else "NOT NULL"
+                    print(f"   - {col[0]} ({col[1]}) {nullable}")
         
-        cursor.close()
-        conn.close()
+                # Show row count (should be 0)
+                cursor.execute("SELECT COUNT(*) FROM predictions;")
+                count = cursor.fetchone()[0]
+                print(f"   Total rows: {count}")
         
         print("\n🎉 Database migration to simple schema completed successfully!")
         print("✅ Ready for new prediction system")
@@ -97,9 +93,6 @@ def migrate_to_simple_schema():
         
     except Exception as e:
         print(f"❌ Migration failed: {e}")
-        if 'conn' in locals():
-            conn.rollback()
-            conn.close()
         return False
 
 def main():
@@ -2,16 +2,197 @@ import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingRegressor
 from sklearn.preprocessing import StandardScaler
+from sklearn.base import clone
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, mean_absolute_error, accuracy_score
 import joblib
 import json
 from datetime import datetime, timedelta
 import os
+import re
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Optional ONNX Runtime inference for single-row predictions
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+# Optional Numba-compiled forest traversal for predict() when ONNX isn't available
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# lz4 decompresses much faster than zlib; joblib detects either on load
+try:
+    import lz4
+    MODEL_COMPRESSION = ('lz4', 3)
+except ImportError:
+    MODEL_COMPRESSION = ('zlib', 3)
+
+# Incremental learning samples: features (n, 7) float64, direction, price and epoch-second timestamp arrays
+INCREMENTAL_DATA_FILE = "models/incremental_data.npz"
+LEGACY_INCREMENTAL_DATA_FILE = "models/incremental_data.json"
+INCREMENTAL_DATA_LIMIT = 100
+
+# Loaded (direction_model, price_model, scaler) per models directory, shared by every
+# PredictionEnhancer in the process and reloaded only when a file's mtime changes
+_MODEL_CACHE = {}
+
+# Feature weight boost for a well-performing setup, by signal type found in its name
+SIGNAL_BOOSTS = {'volume': 0.05, 'momentum': 0.05, 'sentiment': 0.05, 'confluence': 0.1}
+_SIGNAL_PATTERN = re.compile('|'.join(SIGNAL_BOOSTS))
+
+# Insights saved by learn_from_insights(): one JSON object per line, "ts" in epoch seconds
+INSIGHTS_FILE = "models/learning_insights.jsonl"
+LEGACY_INSIGHTS_FILE = "models/learning_insights.json"
+INSIGHTS_RETENTION_DAYS = 180
+
+# Model input columns, in the (alphabetical) order the saved models were trained on
+FEATURE_NAMES = ['btc_dominance', 'btc_price', 'btc_rsi', 'eth_price', 'eth_rsi', 'fear_greed', 'market_cap']
+
+def _safe_float(value, default=0):
+    """Convert a market data value to float, falling back to default"""
+    if value is None:
+        return float(default)
+    if isinstance(value, tuple):
+        value = value[0] if value else default
+    try:
+        return float(value) if value is not None else float(default)
+    except (ValueError, TypeError):
+        return float(default)
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _forest_proba_jit(x, feature, threshold, left, right, value):
+        """Walk every packed tree for one row and average the leaf probabilities"""
+        n_trees = feature.shape[0]
+        proba = np.zeros(value.shape[2])
+        for t in range(n_trees):
+            node = 0
+            while feature[t, node] >= 0:
+                if x[feature[t, node]] <= threshold[t, node]:
+                    node = left[t, node]
+                else:
+                    node = right[t, node]
+            proba += value[t, node]
+        return proba / n_trees
+
+def _fit_on_all_cores(model, X, y):
+    """Fit a joblib-parallel sklearn model using threads on every core"""
+    # Set per fit because joblib's backend config is thread-local; the model
+    # itself keeps n_jobs=None so predict() stays single-threaded
+    with joblib.parallel_backend('threading', n_jobs=-1):
+        return model.fit(X, y)
+
+def _write_features(market_data, out):
+    """Write one record's features into out, a length-7 row in FEATURE_NAMES order"""
+    fear_greed = market_data.get('fear_greed', {})
+    if isinstance(fear_greed, dict):
+        fear_greed = fear_greed.get('index', 50)
+    
+    out[0] = _safe_float(market_data.get('btc_dominance', 50), 50)
+    out[1] = _safe_float(market_data.get('btc_price', 0), 0)
+    out[2] = _safe_float(market_data.get('btc_rsi', 50), 50)
+    out[3] = _safe_float(market_data.get('eth_price', 0), 0)
+    out[4] = _safe_float(market_data.get('eth_rsi', 50), 50)
+    out[5] = _safe_float(fear_greed, 50)
+    out[6] = _safe_float(market_data.get('market_cap', 0), 0)
+
+def _load_incremental_data():
+    """Read the stored incremental samples as arrays, converting the legacy JSON file on first use"""
+    empty = {
+        'features': np.empty((0, len(FEATURE_NAMES)), dtype=np.float64),
+        'direction': np.empty(0, dtype='<U7'),
+        'price': np.empty(0, dtype=np.float64),
+        'timestamp': np.empty(0, dtype=np.int64)
+    }
+    
+    try:
+        if os.path.exists(INCREMENTAL_DATA_FILE):
+            with np.load(INCREMENTAL_DATA_FILE) as stored:
+                return {name: stored[name] for name in empty}
+        
+        if os.path.exists(LEGACY_INCREMENTAL_DATA_FILE):
+            with open(LEGACY_INCREMENTAL_DATA_FILE, "r") as f:
+                samples = json.load(f)
+            if not samples:
+                return empty
+            # The legacy file is left in place; the next save writes the .npz
+            logger.info("Converting %s incremental samples from %s", len(samples), LEGACY_INCREMENTAL_DATA_FILE)
+            return {
+                'features': np.array([sample["features"] for sample in samples], dtype=np.float64),
+                'direction': np.array([sample["direction"] for sample in samples], dtype='<U7'),
+                'price': np.array([sample["price"] for sample in samples], dtype=np.float64),
+                'timestamp': np.array([int(datetime.fromisoformat(sample["timestamp"]).timestamp())
+                                       for sample in samples], dtype=np.int64)
+            }
+    except Exception as e:
+        logger.warning("Could not read incremental data, starting fresh: %s", e)
+    
+    return empty
+
+def _migrate_legacy_insights():
+    """Convert the legacy learning_insights.json array to JSON Lines (once)"""
+    if os.path.exists(INSIGHTS_FILE) or not os.path.exists(LEGACY_INSIGHTS_FILE):
+        return
+    
+    try:
+        with open(LEGACY_INSIGHTS_FILE, "r") as f:
+            insights = json.load(f)
+        
+        tmp_path = INSIGHTS_FILE + ".tmp"
+        with open(tmp_path, "w") as f:
+            for insight in insights:
+                insight["ts"] = int(datetime.fromisoformat(insight["timestamp"]).timestamp())
+                f.write(json.dumps(insight) + "\n")
+        os.replace(tmp_path, INSIGHTS_FILE)
+        # The legacy file is left in place for anything that still reads it directly
+        logger.info("Migrated %s insights from %s to %s", len(insights), LEGACY_INSIGHTS_FILE, INSIGHTS_FILE)
+    except Exception as e:
+        logger.warning("Could not migrate %s: %s", LEGACY_INSIGHTS_FILE, e)
+
+def _compact_insights():
+    """Drop insights older than the retention window once the oldest line is a day past it"""
+    cutoff = int(datetime.now().timestamp()) - INSIGHTS_RETENTION_DAYS * 86400
+    
+    # Lines are appended in time order, so the first one is the oldest
+    with open(INSIGHTS_FILE, "r") as f:
+        first_line = f.readline()
+        if not first_line or json.loads(first_line)["ts"] > cutoff - 86400:
+            return
+        kept = [line for line in f if json.loads(line)["ts"] > cutoff]
+    
+    tmp_path = INSIGHTS_FILE + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.writelines(kept)
+    os.replace(tmp_path, INSIGHTS_FILE)
+
+def _load_model_files(directory):
+    """Load the saved models from directory, reusing the copy in _MODEL_CACHE while the files are unchanged"""
+    paths = [f"{directory}/{name}.joblib" for name in ('direction_model', 'price_model', 'scaler')]
+    mtimes = tuple(os.stat(path).st_mtime_ns for path in paths)
+    key = os.path.abspath(directory)
+    
+    cached = _MODEL_CACHE.get(key)
+    if cached is not None and cached[0] == mtimes:
+        return cached[1]
+    
+    models = tuple(joblib.load(path) for path in paths)
+    _MODEL_CACHE[key] = (mtimes, models)
+    return models
 
 class PredictionEnhancer:
     def __init__(self):
-        self.direction_model = RandomForestClassifier(n_estimators=100, random_state=42)
+        self.direction_model = RandomForestClassifier(n_estimators=50, max_depth=8, max_samples=0.8, random_state=42)
         self.price_model = GradientBoostingRegressor(n_estimators=100, random_state=42)
         self.scaler = StandardScaler()
         self.is_trained = False
@@ -19,77 +200,70 @@ class PredictionEnhancer:
         self.model_metrics = {}
         self.confidence_adjustment_factor = 1.0
         self.risk_adjustment_factor = 1.0
+        self._dir_sess = None
+        self._run_direction = None
+        self._predict_price = None
+        self._forest_arrays = None
+        self._onnx_models = {}
+        self._mean = None
+        self._scale = None
+        # Scratch rows predict() fills in place, so a call allocates no feature arrays:
+        # features are scaled in float64 like scaler.transform, then handed to the
+        # direction forest as float32, the precision sklearn's trees compare in
+        self._feat_buf = np.empty((1, len(FEATURE_NAMES)), dtype=np.float64)
+        self._tree_buf = np.empty((1, len(FEATURE_NAMES)), dtype=np.float32)
         
     def prepare_features(self, market_data):
         """Extract and prepare features from market data"""
         try:
-            features = {}
-            
-            # Helper function to safely convert to float
-            def safe_float(value, default=0):
-                if value is None:
-                    return float(default)
-                if isinstance(value, tuple):
-                    value = value[0] if value else default
-                try:
-                    return float(value) if value is not None else float(default)
-                except (ValueError, TypeError):
-                    return float(default)
-            
-            # Price metrics
-            btc_price = market_data.get('btc_price', 0)
-            eth_price = market_data.get('eth_price', 0)
-            features['btc_price'] = safe_float(btc_price, 0)
-            features['eth_price'] = safe_float(eth_price, 0)
-            
-            # Technical indicators
-            btc_rsi = market_data.get('btc_rsi', 50)
-            eth_rsi = market_data.get('eth_rsi', 50)
-            features['btc_rsi'] = safe_float(btc_rsi, 50)
-            features['eth_rsi'] = safe_float(eth_rsi, 50)
-            
-            # Market sentiment
-            fear_greed = market_data.get('fear_greed', {})
-            if isinstance(fear_greed, dict):
-                features['fear_greed'] = safe_float(fear_greed.get('index', 50), 50)
-            else:
-                features['fear_greed'] = safe_float(fear_greed, 50)
-            
-            # Market metrics
-            market_cap = market_data.get('market_cap', 0)
-            btc_dominance = market_data.get('btc_dominance', 50)
-            features['market_cap'] = safe_float(market_cap, 0)
-            features['btc_dominance'] = safe_float(btc_dominance, 50)
-            
-            # Convert to numpy array
-            feature_names = sorted(features.keys())
-            feature_values = np.array([features[name] for name in feature_names])
-            
-            return feature_values.reshape(1, -1), feature_names
+            features = np.empty((1, len(FEATURE_NAMES)), dtype=np.float64)
+            _write_features(market_data, features[0])
+            return features, FEATURE_NAMES
             
         except Exception as e:
-            print(f"[ERROR] Feature preparation failed: {e}")
+            logger.error("Feature preparation failed: %s", e)
             return None, None
     
+    def prepare_feature_matrix(self, market_data_list):
+        """Vectorized prepare_features for many records - returns an (n, 7) float64 array"""
+        df = pd.DataFrame.from_records(market_data_list)
+        defaults = {'btc_dominance': 50, 'btc_price': 0, 'btc_rsi': 50, 'eth_price': 0,
+                    'eth_rsi': 50, 'fear_greed': 50, 'market_cap': 0}
+        
+        # float64, not float32: the btc_price column is also the price target, and
+        # float32 rounds prices near 100k by ~0.008. Only the ONNX direction input
+        # is converted to float32, the precision the forest compares in anyway
+        X = np.empty((len(df), len(FEATURE_NAMES)), dtype=np.float64)
+        for i, name in enumerate(FEATURE_NAMES):
+            default = defaults[name]
+            if name not in df:
+                X[:, i] = default
+                continue
+            
+            column = df[name]
+            if not pd.api.types.is_numeric_dtype(column):
+                # Unpack fear_greed dicts and (value, ...) tuples like _safe_float does
+                column = column.map(
+                    lambda v: v.get('index', default) if isinstance(v, dict)
+                    else (v[0] if v else default) if isinstance(v, tuple) else v
+                )
+                column = pd.to_numeric(column, errors='coerce')
+            X[:, i] = column.fillna(default).to_numpy(dtype=np.float64)
+        
+        return X
+    
     def prepare_targets(self, prediction_data):
         """Extract target variables from prediction data"""
         targets = {}
         
-        # Direction prediction (up/down/stagnant)
-        direction_map = {
-            'rally': 1,
-            'dip': -1,
-            'stagnation': 0
-        }
-        
+        # Direction prediction (rally wins if both appear)
         prediction_text = prediction_data['prediction'].lower()
-        direction = 0
-        for key, value in direction_map.items():
-            if key in prediction_text:
-                direction = value
-                break
-        
-        targets['direction'] = direction
+        if 'rally' in prediction_text:
+            targets['direction'] = 1
+        elif 'dip' in prediction_text:
+            targets['direction'] = -1
+        else:
+            targets['direction'] = 0  # stagnation
         
         # Price prediction (if available)
         if 'price_targets' in prediction_data:
@@ -100,53 +274,40 @@ class PredictionEnhancer:
     def train_models(self, historical_data, prediction_history):
         """Train models on historical data"""
         try:
-            # Prepare training data
-            X = []
-            y_direction = []
-            y_price = []
-            feature_names = None
-            
-            for pred in prediction_history:
-                if 'market_data' not in pred or 'predictions' not in pred:
-                    continue
-                    
-                market_data = pred['market_data']
-                features, names = self.prepare_features(market_data)
-                
-                if features is not None:
-                    X.append(features[0])
-                    if feature_names is None:
-                        feature_names = names
-                    
-                    # Get direction target
-                    ai_pred = pred['predictions'].get('ai_prediction', '')
-                    if 'bullish' in ai_pred.lower():
-                        y_direction.append('bullish')
-                    elif 'bearish' in ai_pred.lower():
-                        y_direction.append('bearish')
-                    else:
-                        y_direction.append('neutral')
-                    
-                    # Get price target
-                    if 'btc_price' in market_data:
-                        y_price.append(float(market_data['btc_price']))
+            # Prepare training data in one vectorized pass over the usable records
+            records = [pred for pred in prediction_history
+                       if 'market_data' in pred and 'predictions' in pred
+                       and 'btc_price' in pred['market_data']]
             
-            if not X or not y_direction or not y_price:
-                print("[WARN] Insufficient training data")
+            if not records:
+                logger.warning("Insufficient training data")
                 return
             
-            X = np.array(X)
-            y_direction = np.array(y_direction)
-            y_price = np.array(y_price)
+            feature_names = FEATURE_NAMES
+            X = self.prepare_feature_matrix([pred['market_data'] for pred in records])
+            
+            # Direction target from the AI prediction text
+            ai_text = pd.Series([pred['predictions'].get('ai_prediction', '') for pred in records])
+            ai_text = ai_text.fillna('').astype(str).str.lower()
+            y_direction = np.select(
+                [ai_text.str.contains('bullish', regex=False), ai_text.str.contains('bearish', regex=False)],
+                ['bullish', 'bearish'],
+                default='neutral'
+            )
             
-            # Scale features
+            # Price target is the recorded BTC price, straight from the float64 feature column
+            y_price = X[:, FEATURE_NAMES.index('btc_price')].copy()
+            
+            # Scale features - a fresh scaler, since a loaded one may be shared through _MODEL_CACHE
+            self.scaler = clone(self.scaler)
             X_scaled = self.scaler.fit_transform(X)
             
             # Train models
-            self.direction_model.fit(X_scaled, y_direction)
-            self.price_model.fit(X_scaled, y_price)
+            self._fit_models(X_scaled, y_direction, y_price)
             
             self.is_trained = True
+            self._cache_scaler_params()
+            self._prepare_inference()
             
             # Save model metrics
             metrics = {
@@ -165,45 +326,38 @@ class PredictionEnhancer:
             return metrics
             
         except Exception as e:
-            print(f"[ERROR] Model training failed: {e}")
+            logger.error("Model training failed: %s", e)
             return None
     
     def predict(self, market_data):
         """Make predictions using trained models"""
         if not self.is_trained:
-            print("[WARN] Models not trained yet. Returning default predictions.")
-            return {
-                'direction': {
-                    'prediction': 'neutral',
-                    'confidence': 0.5
-                },
-                'price': {
-                    'prediction': market_data.get('btc_price', 0),
-                    'confidence': 0.5
-                }
-            }
+            logger.debug("Models not trained yet. Returning default predictions.")
+            return self._default_prediction(market_data)
         
         try:
-            # Prepare features
-            features, feature_names = self.prepare_features(market_data)
-            if features is None:
-                raise ValueError("Failed to prepare features")
-            
-            # Scale features
-            features_scaled = self.scaler.transform(features)
+            # Prepare and scale features in the reusable scratch rows
+            features_scaled = self._feat_buf
+            _write_features(market_data, features_scaled[0])
+            self._scale_inplace(features_scaled)
+            tree_input = self._tree_buf
+            tree_input[...] = features_scaled
             
             # Make predictions
-            direction_pred = self.direction_model.predict(features_scaled)[0]
-            direction_proba = self.direction_model.predict_proba(features_scaled)[0]
-            price_pred = self.price_model.predict(features_scaled)[0]
-            
-            # Get confidence scores
-            direction_confidence = float(max(direction_proba))
+            run_direction = self._run_direction
+            if run_direction is not None:
+                labels, probabilities = run_direction(None, {'X': tree_input})
+                direction_pred = labels[0]
+                direction_proba = probabilities[0]
+            else:
+                direction_proba = self._forest_predict_proba(tree_input)
+                direction_pred = self.direction_model.classes_[np.argmax(direction_proba)]
+            price_pred = self._predict_price(features_scaled)[0]
             
             return {
                 'direction': {
                     'prediction': direction_pred,
-                    'confidence': direction_confidence
+                    'confidence': float(direction_proba.max())
                 },
                 'price': {
                     'prediction': float(price_pred),
@@ -212,17 +366,139 @@ class PredictionEnhancer:
             }
             
         except Exception as e:
-            print(f"[ERROR] Prediction failed: {e}")
-            return {
-                'direction': {
-                    'prediction': 'neutral',
-                    'confidence': 0.5
-                },
-                'price': {
-                    'prediction': market_data.get('btc_price', 0),
-                    'confidence': 0.5
+            logger.error("Prediction failed: %s", e)
+            return self._default_prediction(market_data)
+
+    def predict_many(self, market_data_list):
+        """Batch version of predict() - one model call for the whole list, same result per record"""
+        if not market_data_list:
+            return []
+
+        if not self.is_trained:
+            logger.debug("Models not trained yet. Returning default predictions.")
+            return [self._default_prediction(market_data) for market_data in market_data_list]
+
+        try:
+            X_scaled = self._scale_inplace(self.prepare_feature_matrix(market_data_list))
+
+            run_direction = self._run_direction
+            if run_direction is not None:
+                directions, probabilities = run_direction(None, {'X': X_scaled.astype(np.float32)})
+            else:
+                probabilities = self.direction_model.predict_proba(X_scaled)
+                directions = self.direction_model.classes_[probabilities.argmax(axis=1)]
+            price_preds = self._predict_price(X_scaled)
+
+            confidences = probabilities.max(axis=1)
+
+            return [
+                {
+                    'direction': {
+                        'prediction': direction,
+                        'confidence': float(confidence)
+                    },
+                    'price': {
+                        'prediction': float(price_pred),
+                        'confidence': 0.7  # Placeholder confidence for price prediction
+                    }
                 }
+                for direction, confidence, price_pred in zip(directions, confidences, price_preds)
+            ]
+
+        except Exception as e:
+            logger.error("Batch prediction failed: %s", e)
+            return [self._default_prediction(market_data) for market_data in market_data_list]
+
+    def _default_prediction(self, market_data):
+        """Neutral prediction used when the models can't produce one"""
+        return {
+            'direction': {
+                'prediction': 'neutral',
+                'confidence': 0.5
+            },
+            'price': {
+                'prediction': market_data.get('btc_price', 0),
+                'confidence': 0.5
             }
+        }
+    
+    def _fit_models(self, X_scaled, y_direction, y_price):
+        """Fit the direction and price models in parallel threads"""
+        # Fit unfitted copies so models shared through _MODEL_CACHE are never changed in place
+        self.direction_model = clone(self.direction_model)
+        self.price_model = clone(self.price_model)
+        
+        # sklearn's tree building releases the GIL, so the two fits use separate cores
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            direction_fit = executor.submit(_fit_on_all_cores, self.direction_model, X_scaled, y_direction)
+            price_fit = executor.submit(self.price_model.fit, X_scaled, y_price)
+            direction_fit.result()
+            price_fit.result()
+    
+    def _cache_scaler_params(self):
+        """Keep the fitted scaler's mean and scale as float64 vectors for predict()"""
+        n_features = self.scaler.n_features_in_
+        mean = self.scaler.mean_ if self.scaler.mean_ is not None else np.zeros(n_features)
+        scale = self.scaler.scale_ if self.scaler.scale_ is not None else np.ones(n_features)
+        # Kept at the scaler's precision: rounding them to float32 moves scaled
+        # values across split thresholds and changes predictions
+        self._mean = np.asarray(mean, dtype=np.float64)
+        self._scale = np.asarray(scale, dtype=np.float64)
+    
+    def _scale_inplace(self, x):
+        """Standardise x in place with the cached scaler vectors, the way scaler.transform does"""
+        np.subtract(x, self._mean, out=x)
+        np.divide(x, self._scale, out=x)
+        return x
+    
+    def _pack_forest(self):
+        """Pack the direction forest's trees into padded (n_trees, n_nodes) arrays for _forest_proba_jit"""
+        trees = [estimator.tree_ for estimator in self.direction_model.estimators_]
+        n_trees = len(trees)
+        max_nodes = max(tree.node_count for tree in trees)
+        n_classes = len(self.direction_model.classes_)
+        
+        # 32-bit arrays halve the bytes each tree walk touches
+        feature = np.full((n_trees, max_nodes), -2, dtype=np.int32)
+        threshold = np.zeros((n_trees, max_nodes), dtype=np.float32)
+        left = np.zeros((n_trees, max_nodes), dtype=np.int32)
+        right = np.zeros((n_trees, max_nodes), dtype=np.int32)
+        value = np.zeros((n_trees, max_nodes, n_classes), dtype=np.float32)
+        
+        for t, tree in enumerate(trees):
+            n = tree.node_count
+            feature[t, :n] = tree.feature
+            # Round thresholds down, not to nearest, so float32 x <= threshold
+            # splits exactly like sklearn's float64 comparison
+            tree_threshold = tree.threshold.astype(np.float32)
+            rounded_up = tree_threshold > tree.threshold
+            tree_threshold[rounded_up] = np.nextafter(tree_threshold[rounded_up], np.float32(-np.inf))
+            threshold[t, :n] = tree_threshold
+            left[t, :n] = tree.children_left
+            right[t, :n] = tree.children_right
+            # Normalise leaf counts to probabilities, as DecisionTreeClassifier.predict_proba does
+            leaf_values = tree.value[:, 0, :]
+            totals = leaf_values.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1.0
+            value[t, :n] = leaf_values / totals
+        
+        return feature, threshold, left, right, value
+    
+    def _forest_predict_proba(self, features_scaled):
+        """Average the forest's per-tree probabilities for a single row.
+        
+        Same result as direction_model.predict_proba, without the joblib
+        dispatch and input validation that dominate one-row calls.
+        """
+        if self._forest_arrays is not None:
+            return _forest_proba_jit(features_scaled[0], *self._forest_arrays)
+        
+        X = np.ascontiguousarray(features_scaled, dtype=np.float32)
+        estimators = self.direction_model.estimators_
+        proba = estimators[0].predict_proba(X, check_input=False)[0]
+        for tree in estimators[1:]:
+            proba = proba + tree.predict_proba(X, check_input=False)[0]
+        return proba / len(estimators)
     
     def save_models(self, directory):
         """Save trained models to directory"""
@@ -230,73 +506,55 @@ class PredictionEnhancer:
             os.makedirs(directory, exist_ok=True)
             
             if self.is_trained:
-                joblib.dump(self.direction_model, f"{directory}/direction_model.joblib")
-                joblib.dump(self.price_model, f"{directory}/price_model.joblib")
-                joblib.dump(self.scaler, f"{directory}/scaler.joblib")
-                print(f"[INFO] Models saved to {directory}")
+                joblib.dump(self.direction_model, f"{directory}/direction_model.joblib", compress=MODEL_COMPRESSION)
+                joblib.dump(self.price_model, f"{directory}/price_model.joblib", compress=MODEL_COMPRESSION)
+                joblib.dump(self.scaler, f"{directory}/scaler.joblib", compress=MODEL_COMPRESSION)
+                for name in ('direction_model', 'price_model'):
+                    onnx_path = f"{directory}/{name}.onnx"
+                    if name in self._onnx_models:
+                        with open(onnx_path, "wb") as f:
+                            f.write(self._onnx_models[name])
+                    elif os.path.exists(onnx_path):
+                        os.remove(onnx_path)  # Stale export of an older model
+                logger.info("Models saved to %s", directory)
             else:
-                print("[WARN] Models not trained - cannot save")
+                logger.warning("Models not trained - cannot save")
                 
         except Exception as e:
-            print(f"[ERROR] Failed to save models: {e}")
+            logger.error("Failed to save models: %s", e)
     
     def incremental_learning(self, new_training_data):
         """Incrementally train models with new validation data"""
         try:
             if not new_training_data:
-                print("[INFO] No new training data provided")
+                logger.info("No new training data provided")
                 return
             
-            print(f"[INFO] Processing {len(new_training_data)} new training samples")
+            logger.info("Processing %s new training samples", len(new_training_data))
             
-            # Extract features and targets from validation data
-            X_new = []
-            y_direction_new = []
-            y_price_new = []
-            
-            for training_point in new_training_data:
-                pred_data = training_point.get("prediction_data", {})
-                validation_points = training_point.get("validation_points", [])
-                actual_btc_price = training_point.get("actual_btc_price")
-                
-                # Extract market data for features
-                market_data = pred_data.get("market_data", {})
-                if not market_data:
-                    continue
-                
-                features, _ = self.prepare_features(market_data)
-                if features is None:
-                    continue
-                
-                X_new.append(features[0])
-                
-                # Determine actual direction based on validation points
-                targets_hit = [vp for vp in validation_points if vp["type"].startswith("PROFESSIONAL_TARGET")]
-                stops_hit = [vp for vp in validation_points if vp["type"] == "PROFESSIONAL_STOP_LOSS"]
-                
-                if targets_hit and not stops_hit:
-                    actual_direction = "bullish"
-                elif stops_hit and not targets_hit:
-                    actual_direction = "bearish"
-                else:
-                    actual_direction = "neutral"
-                
-                y_direction_new.append(actual_direction)
-                
-                # Use actual price for price prediction target
-                if actual_btc_price:
-                    y_price_new.append(float(actual_btc_price))
-                else:
-                    y_price_new.append(float(market_data.get("btc_price", 0)))
+            # Keep the training points that carry market data for features
+            usable = [tp for tp in new_training_data
+                      if tp.get("prediction_data", {}).get("market_data")]
             
-            if not X_new:
-                print("[WARN] No valid training samples extracted")
+            if not usable:
+                logger.warning("No valid training samples extracted")
                 return
             
-            # Convert to numpy arrays
-            X_new = np.array(X_new)
-            y_direction_new = np.array(y_direction_new)
-            y_price_new = np.array(y_price_new)
+            X_new = self.prepare_feature_matrix([tp["prediction_data"]["market_data"] for tp in usable])
+            y_direction_new = self._classify_outcomes(usable)
+            
+            # One summary line for the batch rather than one per training point
+            if logger.isEnabledFor(logging.INFO):
+                outcomes, counts = np.unique(y_direction_new, return_counts=True)
+                logger.info("Extracted %d training samples, outcomes: %s",
+                            len(usable), dict(zip(outcomes.tolist(), counts.tolist())))
+            
+            # Use actual price for price prediction target
+            y_price_new = np.array([
+                float(tp["actual_btc_price"]) if tp.get("actual_btc_price")
+                else float(tp["prediction_data"]["market_data"].get("btc_price", 0))
+                for tp in usable
+            ])
             
             # If models are already trained, use them as base
             if self.is_trained:
@@ -309,75 +567,74 @@ class PredictionEnhancer:
                     # But RandomForest and GradientBoosting don't support partial_fit
                     # So we'll collect this data and retrain periodically
                     
-                    # Save incremental data for future retraining
-                    incremental_file = "models/incremental_data.json"
-                    incremental_data = []
-                    
-                    if os.path.exists(incremental_file):
-                        try:
-                            with open(incremental_file, "r") as f:
-                                incremental_data = json.load(f)
-                        except:
-                            incremental_data = []
-                    
-                    # Add new data
-                    for i in range(len(X_new)):
-                        incremental_data.append({
-                            "features": X_new[i].tolist(),
-                            "direction": y_direction_new[i],
-                            "price": float(y_price_new[i]),
-                            "timestamp": datetime.now().isoformat()
-                        })
-                    
-                    # Keep only last 100 incremental samples
-                    incremental_data = incremental_data[-100:]
+                    # Save incremental data for future retraining, keeping the last INCREMENTAL_DATA_LIMIT samples
+                    stored = _load_incremental_data()
+                    incremental_data = {
+                        'features': np.concatenate([stored['features'], X_new])[-INCREMENTAL_DATA_LIMIT:],
+                        'direction': np.concatenate([stored['direction'], y_direction_new])[-INCREMENTAL_DATA_LIMIT:],
+                        'price': np.concatenate([stored['price'], y_price_new])[-INCREMENTAL_DATA_LIMIT:],
+                        'timestamp': np.concatenate([
+                            stored['timestamp'],
+                            np.full(len(X_new), int(datetime.now().timestamp()), dtype=np.int64)
+                        ])[-INCREMENTAL_DATA_LIMIT:]
+                    }
+                    np.savez(INCREMENTAL_DATA_FILE, **incremental_data)
                     
-                    # Save incremental data
-                    with open(incremental_file, "w") as f:
-                        json.dump(incremental_data, f, indent=4)
-                    
-                    print(f"[INFO] Saved {len(X_new)} incremental learning samples")
+                    logger.info("Saved %s incremental learning samples", len(X_new))
                     
                     # If we have enough incremental data, retrain models
-                    if len(incremental_data) >= 20:
-                        print("[INFO] Retraining models with incremental data")
+                    if len(incremental_data['features']) >= 20:
+                        logger.info("Retraining models with incremental data")
                         self._retrain_with_incremental_data(incremental_data)
                     
                 except Exception as e:
-                    print(f"[ERROR] Incremental learning failed: {e}")
+                    logger.error("Incremental learning failed: %s", e)
             else:
-                print("[INFO] Models not yet trained, storing data for future training")
+                logger.info("Models not yet trained, storing data for future training")
                 
         except Exception as e:
-            print(f"[ERROR] Incremental learning failed: {e}")
+            logger.error("Incremental learning failed: %s", e)
+    
+    def _classify_outcomes(self, training_points):
+        """Actual direction per training point from its validation points, for the whole batch at once"""
+        owners = []
+        types = []
+        for i, training_point in enumerate(training_points):
+            for vp in training_point.get("validation_points", []):
+                owners.append(i)
+                types.append(vp["type"])
+        
+        owners = np.array(owners, dtype=np.intp)
+        types = np.array(types, dtype=str)
+        
+        targets_hit = np.zeros(len(training_points), dtype=bool)
+        stops_hit = np.zeros(len(training_points), dtype=bool)
+        targets_hit[owners[np.char.startswith(types, "PROFESSIONAL_TARGET")]] = True
+        stops_hit[owners[types == "PROFESSIONAL_STOP_LOSS"]] = True
+        
+        return np.select(
+            [targets_hit & ~stops_hit, stops_hit & ~targets_hit],
+            ["bullish", "bearish"],
+            default="neutral"
+        )
     
     def _retrain_with_incremental_data(self, incremental_data):
         """Retrain models with accumulated incremental data"""
         try:
-            if len(incremental_data) < 10:
-                print("[WARN] Insufficient incremental data for retraining")
+            X = incremental_data['features']
+            if len(X) < 10:
+                logger.warning("Insufficient incremental data for retraining")
                 return
             
-            # Extract features and targets
-            X = []
-            y_direction = []
-            y_price = []
-            
-            for sample in incremental_data:
-                X.append(sample["features"])
-                y_direction.append(sample["direction"])
-                y_price.append(sample["price"])
-            
-            X = np.array(X)
-            y_direction = np.array(y_direction)
-            y_price = np.array(y_price)
+            y_direction = incremental_data['direction']
+            y_price = incremental_data['price']
             
-            # Scale features
-            X_scaled = self.scaler.transform(X)
+            # Scale features with the cached scaler vectors
+            X_scaled = self._scale_inplace(X.astype(np.float64))
             
             # Retrain models with new data
-            self.direction_model.fit(X_scaled, y_direction)
-            self.price_model.fit(X_scaled, y_price)
+            self._fit_models(X_scaled, y_direction, y_price)
+            self._prepare_inference()
             
             # Update metrics
             metrics = {
@@ -389,29 +646,76 @@ class PredictionEnhancer:
             # Save updated models
             self.save_models("models")
             
-            print(f"[INFO] Models retrained with {len(X)} incremental samples")
+            logger.info("Models retrained with %s incremental samples", len(X))
             
         except Exception as e:
-            print(f"[ERROR] Incremental retraining failed: {e}")
+            logger.error("Incremental retraining failed: %s", e)
 
     def load_models(self, directory):
         """Load trained models and scaler"""
         try:
-            self.direction_model = joblib.load(f"{directory}/direction_model.joblib")
-            self.price_model = joblib.load(f"{directory}/price_model.joblib")
-            self.scaler = joblib.load(f"{directory}/scaler.joblib")
+            self.direction_model, self.price_model, self.scaler = _load_model_files(directory)
             
             self.is_trained = True
-            print(f"[INFO] Models loaded from {directory}")
+            self._cache_scaler_params()
+            self._prepare_inference(directory)
+            logger.info("Models loaded from %s", directory)
             
         except Exception as e:
-            print(f"[ERROR] Failed to load models: {e}")
+            logger.error("Failed to load models: %s", e)
             self.is_trained = False 
 
+    def _prepare_inference(self, directory=None):
+        """Set up the fastest available predict() path for the fitted models.
+        
+        The direction forest prefers an ONNX Runtime session (reusing a saved
+        .onnx file in directory), then a Numba-compiled walk, then sklearn itself.
+        The price model always predicts through sklearn.
+        """
+        self._forest_arrays = None
+        self._dir_sess = None
+        self._run_direction = None
+        self._onnx_models = {}
+        
+        # Bound once here so predict() skips the attribute lookups per call
+        self._predict_price = self.price_model.predict
+        
+        if ONNX_AVAILABLE:
+            self._open_onnx_sessions(directory)
+        
+        if self._run_direction is None and NUMBA_AVAILABLE:
+            self._forest_arrays = self._pack_forest()
+    
+    def _open_onnx_sessions(self, directory):
+        """Convert the direction forest to ONNX and open an inference session for predict().
+        
+        The price model stays on sklearn: ONNX Runtime's tree regressor returns
+        float32, which would round BTC price predictions.
+        """
+        try:
+            onnx_path = f"{directory}/direction_model.onnx" if directory else None
+            if onnx_path and os.path.exists(onnx_path):
+                with open(onnx_path, "rb") as f:
+                    self._onnx_models['direction_model'] = f.read()
+            else:
+                initial_types = [('X', FloatTensorType([None, self.scaler.n_features_in_]))]
+                options = {id(self.direction_model): {'zipmap': False}}
+                onnx_model = convert_sklearn(self.direction_model, initial_types=initial_types, options=options)
+                self._onnx_models['direction_model'] = onnx_model.SerializeToString()
+            
+            self._dir_sess = ort.InferenceSession(self._onnx_models['direction_model'], providers=['CPUExecutionProvider'])
+            self._run_direction = self._dir_sess.run
+            
+        except Exception as e:
+            logger.warning("ONNX conversion failed, using sklearn for predictions: %s", e)
+            self._dir_sess = None
+            self._run_direction = None
+            self._onnx_models = {}
+
     def learn_from_insights(self, insights):
         """Learn from deep analysis insights to improve future predictions"""
         try:
-            print("[INFO] Processing deep learning insights for model improvement...")
+            logger.debug("Processing deep learning insights for model improvement...")
             
             # Extract key patterns for model adjustment
             improvement_data = {
@@ -430,34 +734,20 @@ class PredictionEnhancer:
             # Update feature importance weights
             self._update_feature_weights(improvement_data)
             
-            # Save insights for future reference
-            insights_file = "models/learning_insights.json"
+            # Save insights for future reference - one appended line per call
+            improvement_data["ts"] = int(datetime.now().timestamp())
             os.makedirs("models", exist_ok=True)
+            _migrate_legacy_insights()
             
-            all_insights = []
-            if os.path.exists(insights_file):
-                try:
-                    with open(insights_file, "r") as f:
-                        all_insights = json.load(f)
-                except Exception:
-                    all_insights = []
-            
-            all_insights.append(improvement_data)
-            
-            # Keep only last 6 months of insights
-            cutoff = datetime.now() - timedelta(days=180)
-            all_insights = [insight for insight in all_insights 
-                           if datetime.fromisoformat(insight["timestamp"]) > cutoff]
+            with open(INSIGHTS_FILE, "a") as f:
+                f.write(json.dumps(improvement_data) + "\n")
             
-            with open(insights_file, "w") as f:
-                json.dump(all_insights, f, indent=4)
+            _compact_insights()
             
-            print(f"[INFO] ML models updated with insights - {len(all_insights)} historical insights stored")
+            logger.info("ML models updated with insights - stored in %s", INSIGHTS_FILE)
             
         except Exception as e:
-            print(f"[ERROR] Failed to learn from insights: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Failed to learn from insights: %s", e)
     
     def _adjust_model_parameters(self, improvement_data):
         """Adjust model parameters based on performance insights"""
@@ -468,20 +758,20 @@ class PredictionEnhancer:
         if psychological.get("overconfidence_bias", 0) > 0.3:
             # Reduce confidence scaling if overconfident
             self.confidence_adjustment_factor = max(0.8, self.confidence_adjustment_factor - 0.05)
-            print(f"[INFO] Reduced confidence scaling to {self.confidence_adjustment_factor} due to overconfidence")
+            logger.info("Reduced confidence scaling to %s due to overconfidence", self.confidence_adjustment_factor)
         elif psychological.get("confidence_calibration", 0) > 0.15:
             # Increase confidence scaling if well-calibrated
             self.confidence_adjustment_factor = min(1.2, self.confidence_adjustment_factor + 0.02)
-            print(f"[INFO] Increased confidence scaling to {self.confidence_adjustment_factor} - good calibration")
+            logger.info("Increased confidence scaling to %s - good calibration", self.confidence_adjustment_factor)
         
         # Adjust risk parameters based on R-expectancy
         r_expectancy = performance.get("r_expectancy", 0)
         if r_expectancy < 0:
             self.risk_adjustment_factor = max(0.5, self.risk_adjustment_factor - 0.1)
-            print(f"[INFO] Reduced risk factor to {self.risk_adjustment_factor} due to negative expectancy")
+            logger.info("Reduced risk factor to %s due to negative expectancy", self.risk_adjustment_factor)
         elif r_expectancy > 0.3:
             self.risk_adjustment_factor = min(1.5, self.risk_adjustment_factor + 0.05)
-            print(f"[INFO] Increased risk factor to {self.risk_adjustment_factor} - strong expectancy")
+            logger.info("Increased risk factor to %s - strong expectancy", self.risk_adjustment_factor)
     
     def _update_feature_weights(self, improvement_data):
         """Update feature importance weights based on what's working"""
@@ -493,15 +783,10 @@ class PredictionEnhancer:
             # Extract signal types from best performing setups
             for setup_name, stats in best_setups.items():
                 if stats.get("expectancy_score", 0) > 0.3:
-                    # This setup is performing well, boost related features
-                    if "volume" in setup_name.lower():
-                        self._boost_feature_weight("volume_signals", 0.05)
-                    if "momentum" in setup_name.lower():
-                        self._boost_feature_weight("momentum_signals", 0.05)
-                    if "sentiment" in setup_name.lower():
-                        self._boost_feature_weight("sentiment_signals", 0.05)
-                    if "confluence" in setup_name.lower():
-                        self._boost_feature_weight("confluence_signals", 0.1)
+                    # This setup is performing well, boost related features (once per signal type)
+                    signals = dict.fromkeys(_SIGNAL_PATTERN.findall(setup_name.lower()))
+                    for signal in signals:
+                        self._boost_feature_weight(f"{signal}_signals", SIGNAL_BOOSTS[signal])
         
         # Adjust based on market condition performance
         volatility_perf = market_conditions.get("volatility", {})
@@ -522,7 +807,7 @@ class PredictionEnhancer:
         current_weight = self.feature_weights.get(feature_category, 1.0)
         new_weight = min(1.5, current_weight + boost_amount)  # Cap at 1.5x
         self.feature_weights[feature_category] = new_weight
-        print(f"[INFO] Boosted {feature_category} weight to {new_weight:.3f}")
+        logger.debug("Boosted %s weight to %.3f", feature_category, new_weight)
     
     def get_feature_weights(self):
         """Get current feature weights for model training"""
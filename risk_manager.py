@@ -4,6 +4,25 @@ from datetime import datetime, timedelta
 import json
 import os
 
+def _risk_score(volatility, prediction_confidence):
+    """Risk score (0-100) from annualized volatility (None if unknown) and prediction confidence"""
+    risk_score = 50  # Base risk score
+    
+    # Adjust based on volatility
+    if volatility is not None:
+        if volatility > 0.8:  # High volatility
+            risk_score += 20
+        elif volatility < 0.2:  # Low volatility
+            risk_score -= 20
+    
+    # Adjust based on prediction confidence
+    if prediction_confidence > 0.8:
+        risk_score -= 15
+    elif prediction_confidence < 0.5:
+        risk_score += 15
+    
+    return min(max(risk_score, 0), 100)
+
 class RiskManager:
     def __init__(self):
         self.risk_metrics = {}
@@ -48,23 +67,9 @@ class RiskManager:
         self.risk_metrics['prediction_confidence'] = prediction_confidence
         
         # Calculate risk score (0-100)
-        risk_score = 50  # Base risk score
-        
-        # Adjust based on volatility
-        if 'volatility' in self.risk_metrics:
-            vol = self.risk_metrics['volatility']
-            if vol > 0.8:  # High volatility
-                risk_score += 20
-            elif vol < 0.2:  # Low volatility
-                risk_score -= 20
-        
-        # Adjust based on prediction confidence
-        if prediction_confidence > 0.8:
-            risk_score -= 15
-        elif prediction_confidence < 0.5:
-            risk_score += 15
-        
-        self.risk_metrics['risk_score'] = min(max(risk_score, 0), 100)
+        self.risk_metrics['risk_score'] = _risk_score(
+            self.risk_metrics.get('volatility'), prediction_confidence
+        )
     
     def calculate_position_size(self, account_size, risk_per_trade=0.02):
         """Calculate position size based on risk metrics"""
@@ -47,9 +47,18 @@ def main():
         spec = importlib.util.spec_from_file_location("crypto_analysis", "6.py")
         crypto_module = importlib.util.module_from_spec(spec)
         
-        log("Executing crypto analysis...")
         spec.loader.exec_module(crypto_module)
         
+        # Loading only defines the module (its __main__ block is skipped); main() runs
+        # the analysis in this interpreter, reusing the imports already loaded
+        log("Executing crypto analysis...")
+        try:
+            crypto_module.main()
+        except SystemExit as e:
+            if e.code not in (0, None):
+                log(f"❌ Crypto analysis exited with code {e.code}")
+                sys.exit(e.code)
+        
         log("✅ Crypto analysis completed successfully")
         
     except ImportError as e:
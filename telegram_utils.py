@@ -1,12 +1,38 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
 import time
 
+def create_http_session():
+    """Create a requests session that keeps connections alive and retries transient errors
+    
+    urllib3 only retries idempotent methods by default, so a sendMessage POST
+    is never repeated (and never delivered twice).
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+# Shared by every Telegram call so repeat requests reuse the same TLS connection
+SESSION = create_http_session()
+
 class TelegramBot:
     def __init__(self, bot_token=None, chat_id=None):
         self.bot_token = bot_token or os.environ.get("TELEGRAM_BOT_TOKEN")
         self.chat_id = chat_id or os.environ.get("TELEGRAM_CHAT_ID")
+        self.session = SESSION
         
     def send_message(self, message, disable_web_page_preview=True, parse_mode="HTML"):
         """Send a message to Telegram with length checking and error handling"""
@@ -29,7 +55,7 @@ class TelegramBot:
         }
             
             print(f"[DEBUG] Sending message ({len(message)} chars)")
-            response = requests.post(url, json=payload, timeout=30)
+            response = self.session.post(url, json=payload, timeout=30)
             
             # Get response details for debugging
             result = response.json()
@@ -74,7 +100,7 @@ class TelegramBot:
                 "disable_web_page_preview": disable_web_page_preview
             }
             
-            response = requests.post(url, json=payload, timeout=30)
+            response = self.session.post(url, json=payload, timeout=30)
             result = response.json()
             
             if response.status_code == 200 and result.get("ok"):
@@ -217,7 +243,7 @@ def send_telegram_message(message, disable_web_page_preview=True):
             "disable_web_page_preview": disable_web_page_preview
         }
         # Use json=payload instead of data=payload for better compatibility
-        response = requests.post(url, json=payload)
+        response = SESSION.post(url, json=payload)
         response.raise_for_status()
         
         # Check if the response is actually successful
@@ -2,8 +2,11 @@
 
 import os
 import json
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
-from database_manager import db_manager
+from unittest import mock
+from database_manager import db_manager, DatabaseManager
 
 def test_database_integration():
     """Test database integration functionality"""
@@ -134,9 +137,179 @@ def test_database_integration():
     
     return health['database_available']
 
+@contextmanager
+def _scratch_manager(backend):
+    """A fresh DatabaseManager on the given backend ('sqlite' or 'json') in a scratch directory"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            if backend == 'sqlite':
+                env = {k: v for k, v in os.environ.items() if k != 'DATABASE_URL'}
+            else:
+                # A database in a missing directory can't be opened, so the manager falls back to JSON
+                env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(scratch, 'missing', 'db.sqlite')}")
+            with mock.patch.dict(os.environ, env, clear=True):
+                manager = DatabaseManager()
+            assert manager.use_database == (backend == 'sqlite')
+            try:
+                yield manager
+            finally:
+                manager.flush()
+                if manager.engine is not None:
+                    manager.engine.dispose()
+        finally:
+            os.chdir(cwd)
+
+BACKENDS = ('sqlite', 'json')
+
+def _test_predictions(count):
+    """Predictions with distinct timestamps, in the shape the trading collectors save"""
+    return [
+        {
+            "date": "2025-06-01",
+            "time": f"{8 + i:02d}:00",
+            "timestamp": f"2025-06-01T{8 + i:02d}:00:00",
+            "method": "ai",
+            "entry_level": 100000.0 + i,
+            "stop_loss": 98000.0,
+            "take_profit": 104000.0,
+            "confidence": 0.6,
+            "accuracy": 0.3,
+            "coin": "BTC"
+        }
+        for i in range(count)
+    ]
+
+def _by_timestamp(predictions):
+    return {prediction['timestamp']: prediction for prediction in predictions}
+
+def test_save_predictions_bulk():
+    """save_predictions_bulk stores every prediction and accepts an empty batch"""
+    for backend in BACKENDS:
+        with _scratch_manager(backend) as manager:
+            predictions = _test_predictions(3)
+            assert manager.save_predictions_bulk(predictions), backend
+            assert manager.save_predictions_bulk([]), backend
+            
+            loaded = _by_timestamp(manager.load_predictions())
+            assert set(loaded) == {p['timestamp'] for p in predictions}, backend
+            for prediction in predictions:
+                stored = loaded[prediction['timestamp']]
+                assert stored['entry_level'] == prediction['entry_level'], backend
+                assert stored['method'] == 'ai', backend
+
+def test_resave_same_prediction_key():
+    """Re-saving a prediction for the same timestamp, method and coin (as validation does) succeeds"""
+    for backend in BACKENDS:
+        with _scratch_manager(backend) as manager:
+            prediction = _test_predictions(1)[0]
+            assert manager.save_prediction(prediction), backend
+            assert manager.save_prediction(dict(prediction, accuracy=0.9)), backend
+            assert manager.save_predictions_bulk([dict(prediction, accuracy=0.7), _test_predictions(2)[1]]), backend
+            assert len(manager.load_predictions()) == 4, backend
+
+def test_bulk_update_validation():
+    """bulk_update_validation updates listed predictions, keeps accuracy on None and skips unknown ids"""
+    for backend in BACKENDS:
+        with _scratch_manager(backend) as manager:
+            predictions = _test_predictions(3)
+            assert manager.save_predictions_bulk(predictions), backend
+            points = [{"coin": "BTC", "type": "TARGET_HIT", "predicted_level": 104000.0}]
+            
+            assert manager.bulk_update_validation([
+                (predictions[0]['timestamp'], points, 0.9),
+                (predictions[1]['timestamp'], points, None),
+                ("2020-01-01T00:00:00", points, 0.1)
+            ]), backend
+            
+            loaded = _by_timestamp(manager.load_predictions())
+            assert len(loaded) == 3, backend
+            first, second, untouched = (loaded[p['timestamp']] for p in predictions)
+            assert first['validation_points'] == points and first['accuracy'] == 0.9, backend
+            assert second['validation_points'] == points and second['accuracy'] == 0.3, backend
+            assert first['validated_at'] and second['validated_at'], backend
+            assert not untouched.get('validation_points') and untouched['accuracy'] == 0.3, backend
+            assert not untouched.get('validated_at'), backend
+
+def test_update_prediction_validation_unknown_id():
+    """update_prediction_validation fails for a timestamp no prediction has, on both backends"""
+    for backend in BACKENDS:
+        with _scratch_manager(backend) as manager:
+            prediction = _test_predictions(1)[0]
+            assert manager.save_prediction(prediction), backend
+            points = [{"coin": "BTC", "type": "TARGET_HIT"}]
+            
+            assert manager.update_prediction_validation(prediction['timestamp'], points, 0.9), backend
+            assert not manager.update_prediction_validation("2020-01-01T00:00:00", points, 0.9), backend
+
+def test_update_prediction_accuracies():
+    """update_prediction_accuracies counts the predictions it updated (database only)"""
+    for backend in BACKENDS:
+        with _scratch_manager(backend) as manager:
+            assert manager.save_predictions_bulk(_test_predictions(2)), backend
+            
+            if backend == 'json':
+                # JSON predictions have no ids to update by
+                assert manager.update_prediction_accuracies({1: 0.8}) == 0
+                continue
+            
+            ids = [prediction['id'] for prediction in manager.get_predictions_by_method('ai')]
+            assert len(ids) == 2
+            updates = {ids[0]: 0.8, ids[1]: 0.2, max(ids) + 1000: 0.5}
+            assert manager.update_prediction_accuracies(updates) == 2
+            assert manager.update_prediction_accuracies({}) == 0
+            
+            accuracies = {p['id']: p['accuracy'] for p in manager.get_predictions_by_method('ai')}
+            assert accuracies == {ids[0]: 0.8, ids[1]: 0.2}
+
+def test_cached_reads_are_isolated():
+    """Mutating rows returned from the read cache, nested values included, doesn't change later reads"""
+    with _scratch_manager('sqlite') as manager:
+        assert manager.save_learning_insight("weekly", "2025-W22", {"stats": {"win_rate": 0.6}, "coins": ["BTC"]})
+        
+        insight = manager.get_learning_insights("weekly")[0]
+        insight['data']['stats']['win_rate'] = 0.0
+        insight['data']['coins'].append("ETH")
+        insight['period'] = "changed"
+        
+        cached = manager.get_learning_insights("weekly")[0]
+        assert cached['data'] == {"stats": {"win_rate": 0.6}, "coins": ["BTC"]}
+        assert cached['period'] == "2025-W22"
+
+def test_get_insights_containing():
+    """get_insights_containing matches jsonb `@>` containment, including nested objects and lists"""
+    for backend in BACKENDS:
+        with _scratch_manager(backend) as manager:
+            assert manager.save_learning_insight("weekly", "2025-W22", {
+                "setup": "breakout", "stats": {"win_rate": 0.6, "trades": 10}, "coins": ["BTC", "ETH"]
+            }), backend
+            assert manager.save_learning_insight("weekly", "2025-W23", {
+                "setup": "range", "stats": {"win_rate": 0.4, "trades": 8}, "coins": ["BTC"]
+            }), backend
+            assert manager.save_learning_insight("monthly", "2025-06", {
+                "setup": "breakout", "stats": {"win_rate": 0.5}
+            }), backend
+            
+            def periods(fragment, **kwargs):
+                return sorted(i['period'] for i in manager.get_insights_containing(fragment, **kwargs))
+            
+            assert periods({"setup": "breakout"}) == ["2025-06", "2025-W22"], backend
+            assert periods({"stats": {"win_rate": 0.4}}) == ["2025-W23"], backend
+            assert periods({"coins": ["ETH"]}) == ["2025-W22"], backend
+            assert periods({"coins": ["BTC"]}) == ["2025-W22", "2025-W23"], backend
+            assert periods({"setup": "trend"}) == [], backend
+            assert periods({}) == ["2025-06", "2025-W22", "2025-W23"], backend
+            assert len(periods({"setup": "breakout"}, limit=1)) == 1, backend
+
 if __name__ == "__main__":
     try:
         test_database_integration()
+        
+        for name, test in list(globals().items()):
+            if name.startswith('test_') and name != 'test_database_integration' and callable(test):
+                test()
+                print(f"✅ {name}")
     except Exception as e:
         print(f"❌ Test failed with error: {e}")
         import traceback
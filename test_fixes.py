@@ -7,6 +7,9 @@ This script tests the main issues identified in the render logs
 import os
 import sys
 import asyncio
+import subprocess
+import threading
+from collections import deque
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -229,6 +232,15 @@ def test_network_health_validation():
         traceback.print_exc()
         return False
 
+def _pump_output(stream, label, tail=None):
+    """Echo a child process stream line by line, optionally keeping its last lines"""
+    for line in stream:
+        line = line.rstrip("\n")
+        print(f"   [{label}] {line}")
+        if tail is not None:
+            tail.append(line)
+    stream.close()
+
 def test_main_script():
     """Test the main script with fixes"""
     print("\n" + "="*60)
@@ -238,18 +250,36 @@ def test_main_script():
     try:
         print("🧪 Running main script in analysis mode...")
         
-        # Import and run the main function
-        import subprocess
-        result = subprocess.run([
+        # Stream the child's output as it runs instead of buffering all of it
+        proc = subprocess.Popen([
             sys.executable, "6.py", "--analysis"
-        ], capture_output=True, text=True, timeout=300)
-        
-        print(f"   Return code: {result.returncode}")
-        print(f"   stdout: {result.stdout[-500:]}")  # Last 500 chars
-        if result.stderr:
-            print(f"   stderr: {result.stderr[-500:]}")  # Last 500 chars
-        
-        if result.returncode == 0:
+        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1)
+        
+        stderr_tail = deque(maxlen=10)
+        readers = [
+            threading.Thread(target=_pump_output, args=(proc.stdout, "stdout"), daemon=True),
+            threading.Thread(target=_pump_output, args=(proc.stderr, "stderr", stderr_tail), daemon=True)
+        ]
+        for reader in readers:
+            reader.start()
+        
+        try:
+            returncode = proc.wait(timeout=300)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            for reader in readers:
+                reader.join(timeout=5)
+        
+        print(f"   Return code: {returncode}")
+        if stderr_tail:
+            print("   stderr (last lines):")
+            for line in stderr_tail:
+                print(f"      {line}")
+        
+        if returncode == 0:
             print("   ✅ Main script completed successfully")
             return True
         else:
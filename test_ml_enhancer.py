@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Checks that PredictionEnhancer's fast prediction paths give the same results
+as plain sklearn (scaler.transform + predict_proba / predict)
+"""
+
+import os
+import random
+import tempfile
+import numpy as np
+import ml_enhancer
+from ml_enhancer import PredictionEnhancer
+
+def _market_data(rng):
+    """One random market_data record in the shapes the collectors produce"""
+    return {
+        'btc_price': rng.uniform(20000, 110000),
+        'eth_price': rng.uniform(1000, 4000),
+        'btc_rsi': rng.uniform(20, 80),
+        'eth_rsi': rng.uniform(20, 80),
+        'fear_greed': {'index': rng.randint(0, 100)} if rng.random() < 0.5 else rng.randint(0, 100),
+        'market_cap': rng.uniform(1e12, 3e12),
+        'btc_dominance': rng.uniform(40, 60)
+    }
+
+def _trained_enhancer(n_samples=200, seed=0):
+    """Train a PredictionEnhancer on synthetic history (in a scratch directory)"""
+    rng = random.Random(seed)
+    history = []
+    for _ in range(n_samples):
+        market_data = _market_data(rng)
+        rsi = market_data['btc_rsi']
+        label = 'bullish' if rsi < 40 else 'bearish' if rsi > 60 else 'neutral'
+        history.append({'market_data': market_data, 'predictions': {'ai_prediction': f'{label} outlook'}})
+
+    return _train(history)
+
+def _train(history):
+    """Train a PredictionEnhancer on history (in a scratch directory)"""
+    enhancer = PredictionEnhancer()
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        # train_models writes models/model_metrics.json relative to the working directory
+        os.chdir(scratch)
+        try:
+            assert enhancer.train_models(None, history) is not None
+        finally:
+            os.chdir(cwd)
+    return enhancer
+
+def _inference_paths(enhancer):
+    """Switch enhancer through each available direction path, yielding its name"""
+    if enhancer._run_direction is not None:
+        yield 'onnx'
+    enhancer._run_direction = None
+    if ml_enhancer.NUMBA_AVAILABLE:
+        enhancer._forest_arrays = enhancer._pack_forest()
+        yield 'numba'
+    enhancer._forest_arrays = None
+    yield 'sklearn'
+
+def _reference_prediction(enhancer, market_data):
+    """What plain sklearn predicts for market_data"""
+    features, _ = enhancer.prepare_features(market_data)
+    features_scaled = enhancer.scaler.transform(features)
+    proba = enhancer.direction_model.predict_proba(features_scaled)[0]
+    return (enhancer.direction_model.classes_[np.argmax(proba)], proba.max(),
+            enhancer.price_model.predict(features_scaled)[0])
+
+def test_predict_matches_sklearn():
+    """predict() gives sklearn's direction, confidence and price on every inference path"""
+    enhancer = _trained_enhancer()
+    rng = random.Random(1)
+    rows = [_market_data(rng) for _ in range(200)]
+    expected = [_reference_prediction(enhancer, row) for row in rows]
+
+    for path in _inference_paths(enhancer):
+        for i, (row, (direction, confidence, price)) in enumerate(zip(rows, expected)):
+            result = enhancer.predict(row)
+            context = f"{path} path, row {i}"
+            assert result['direction']['prediction'] == direction, context
+            assert abs(result['direction']['confidence'] - confidence) < 1e-6, context
+            assert result['price']['prediction'] == price, context
+
+def test_predict_many_matches_predict():
+    """predict_many(rows) gives what predict() gives row by row, trained or not"""
+    rng = random.Random(3)
+    rows = [_market_data(rng) for _ in range(200)]
+
+    untrained = PredictionEnhancer()
+    assert untrained.predict_many(rows) == [untrained.predict(row) for row in rows]
+    assert untrained.predict_many([]) == []
+
+    enhancer = _trained_enhancer()
+    for path in _inference_paths(enhancer):
+        batch = enhancer.predict_many(rows)
+        assert len(batch) == len(rows)
+        for i, (result, row) in enumerate(zip(batch, rows)):
+            expected = enhancer.predict(row)
+            context = f"{path} path, row {i}"
+            assert result['direction']['prediction'] == expected['direction']['prediction'], context
+            # Only the per-row walks sum tree probabilities in a different order
+            assert abs(result['direction']['confidence'] - expected['direction']['confidence']) < 1e-6, context
+            assert result['price'] == expected['price'], context
+
+def test_price_target_keeps_float64_prices():
+    """The price model is fitted on the recorded BTC prices, not float32-rounded copies"""
+    rng = random.Random(2)
+    history = []
+    for _ in range(50):
+        market_data = _market_data(rng)
+        market_data['btc_price'] = 100000 + rng.random()  # float32 would round these to ~0.008
+        history.append({'market_data': market_data, 'predictions': {'ai_prediction': 'bullish'}})
+
+    enhancer = _train(history)
+    prices = np.array([pred['market_data']['btc_price'] for pred in history])
+    # GradientBoostingRegressor starts from the mean of its targets
+    assert enhancer.price_model.init_.constant_[0][0] == np.mean(prices)
+
+if __name__ == "__main__":
+    tests = [(name, test) for name, test in globals().items() if name.startswith('test_') and callable(test)]
+    for name, test in tests:
+        test()
+        print(f"✅ {name}")
@@ -15,13 +15,26 @@ from dotenv import load_dotenv
 
 # Import database manager
 try:
-    from database_manager import DatabaseManager
+    from database_manager import DatabaseManager, PREDICTIONS_FILE
     db_manager = DatabaseManager()
     DATABASE_AVAILABLE = True
     print("[INFO] Database manager loaded successfully")
 except ImportError:
     print("[WARN] Database manager not available, using JSON files only")
     DATABASE_AVAILABLE = False
+    # The JSON Lines file database_manager falls back to
+    PREDICTIONS_FILE = "detailed_predictions.jsonl"
+
+def load_predictions_file(filename=PREDICTIONS_FILE):
+    """Read a JSON Lines predictions file (one prediction per line)"""
+    with open(filename, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def save_predictions_file(predictions, filename=PREDICTIONS_FILE):
+    """Rewrite a JSON Lines predictions file"""
+    with open(filename, "w") as f:
+        for prediction in predictions:
+            f.write(json.dumps(prediction, default=str) + "\n")
 
 def load_telegram_config():
     """Load Telegram configuration from environment variables or config file"""
@@ -158,18 +171,21 @@ def get_crypto_prices():
     
     # If all APIs fail, try to use latest saved prices
     try:
-        prediction_file = "detailed_predictions.json"
-        if os.path.exists(prediction_file):
-            with open(prediction_file, "r") as f:
-                predictions = json.load(f)
-                if predictions and len(predictions) > 0:
-                    latest = predictions[-1]
-                    if "market_data" in latest:
-                        btc_price = latest["market_data"].get("btc_price")
-                        eth_price = latest["market_data"].get("eth_price")
-                        if btc_price is not None and eth_price is not None:
-                            print("[INFO] Using latest saved prices as fallback")
-                            return {"btc": btc_price, "eth": eth_price}
+        if DATABASE_AVAILABLE:
+            predictions = db_manager.load_predictions(limit=1)
+        elif os.path.exists(PREDICTIONS_FILE):
+            predictions = load_predictions_file()[-1:]
+        else:
+            predictions = []
+        
+        if predictions and len(predictions) > 0:
+            latest = predictions[-1]
+            if "market_data" in latest:
+                btc_price = latest["market_data"].get("btc_price")
+                eth_price = latest["market_data"].get("eth_price")
+                if btc_price is not None and eth_price is not None:
+                    print("[INFO] Using latest saved prices as fallback")
+                    return {"btc": btc_price, "eth": eth_price}
     except Exception as e:
         errors.append(f"Fallback: {str(e)}")
     
@@ -491,8 +507,8 @@ def validate_predictions():
         else:
             try:
                 print("[INFO] Loading predictions from JSON file...")
-                with open("detailed_predictions.json", "r") as f:
-                    predictions = json.load(f)
+                all_predictions = load_predictions_file()
+                predictions = all_predictions
                 if predictions:
                     print(f"[INFO] Found {len(predictions)} total predictions")
                     # Filter predictions that need validation
@@ -531,9 +547,10 @@ def validate_predictions():
             # Save updated prediction
             if DATABASE_AVAILABLE:
                 db_manager.save_prediction(prediction)
-            else:
-                with open("detailed_predictions.json", "w") as f:
-                    json.dump(predictions, f, indent=4, default=str)
+        
+        if not DATABASE_AVAILABLE:
+            # Whole file, so predictions that didn't need validation are kept
+            save_predictions_file(all_predictions)
         
         # Generate and send report
         print("[INFO] Generating validation report...")
@@ -1505,9 +1522,9 @@ def classify_time_session(hour):
     else:
         return "us_evening"
 
-if __name__ == "__main__":
+def main():
+    """Command line entry point (also callable in-process by a scheduler)"""
     # Check for test mode argument
-    import sys
     if len(sys.argv) > 1 and sys.argv[1] == "--test":
         config = load_config()
         config["test_mode"]["enabled"] = True
@@ -1520,13 +1537,12 @@ if __name__ == "__main__":
         print("[TEST] Testing deep learning analysis...")
         
         # Load predictions for analysis
-        prediction_file = "detailed_predictions.json"
+        prediction_file = PREDICTIONS_FILE
         if config["test_mode"]["enabled"]:
             prediction_file = config["test_mode"]["output_prefix"] + prediction_file
         
         if os.path.exists(prediction_file):
-            with open(prediction_file, "r") as f:
-                predictions = json.load(f)
+            predictions = load_predictions_file(prediction_file)
             
             if predictions:
                 print(f"[TEST] Analyzing {len(predictions)} predictions...")
@@ -1563,3 +1579,6 @@ if __name__ == "__main__":
             print(f"[TEST] No prediction file found: {prediction_file}")
     else:
         validate_predictions()
+
+if __name__ == "__main__":
+    main()